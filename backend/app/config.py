@@ -113,6 +113,11 @@ class Settings(BaseSettings):
         description="Redact PII from logs"
     )
 
+    max_log_snippet: int = Field(
+        default=500,
+        description="Maximum characters of raw agent output kept in parse-error audit data"
+    )
+
     # ==========================================================================
     # Retry Settings
     # ==========================================================================
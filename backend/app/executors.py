@@ -511,7 +511,7 @@ class SummarizeExecutor(Executor):
             run_id=state.run_id,
             decision=decision_packet.decision.value,
             summary=decision_packet.rationale[0] if decision_packet.rationale else "",
-            decision_packet=decision_packet.model_dump(),
+            decision_packet=decision_packet.model_dump(mode="json"),
         )
 
         run_logger.step_completed("summarize", f"Final decision: {decision_packet.decision.value}")
@@ -4,17 +4,20 @@ Wraps the Azure AI Projects SDK with retry logic and error handling.
 """
 
 import asyncio
+import itertools
 import json
+import re
 import uuid
-from datetime import datetime, timezone
 from typing import Any, Optional
 
+import orjson
 from azure.identity.aio import DefaultAzureCredential, get_bearer_token_provider
 from azure.ai.projects.aio import AIProjectClient
 from openai import AsyncAzureOpenAI
 
 from .config import get_settings, is_dry_run
 from .schemas import (
+    _utcnow_iso,
     LiquidityResult,
     ProceduresResult,
     SanctionsDecision,
@@ -27,6 +30,65 @@ from .logging_config import get_logger, RunbookLogger
 
 logger = get_logger("foundry_client")
 
+# Shared helpers for _extract_json
+_CODEBLOCK_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+_JSON_DECODER = json.JSONDecoder()
+
+
+# =============================================================================
+# Error-Path Templates
+# =============================================================================
+# Validated once at import; per-call results are deep copies made with model_copy()
+# so failures (which tend to arrive in bursts) skip full model validation.
+
+_ERROR_SANCTIONS_ESCALATE = SanctionsResult(
+    beneficiary_screened="",
+    decision=SanctionsDecision.ESCALATE,
+    confidence=0,
+    match_type="ERROR",
+    recommendation="System error - manual review required",
+    pass_to_next_agent=False,
+)
+
+_ERROR_LIQUIDITY_DEGRADED = LiquidityResult(
+    payment_assessed={},
+    breach_assessment={"breach": True},
+    account_summary={},
+    recommendation={
+        "action": "ESCALATE",
+        "reason": "System degradation - liquidity check unavailable",
+        "alternatives": ["Manual liquidity verification required"],
+    },
+    pass_to_next_agent=True,
+)
+
+_ERROR_PROCEDURES_HOLD = ProceduresResult(
+    input_summary={},
+    workflow_determination={
+        "final_action": "HOLD",
+        "reason": "System degradation - manual review required",
+        "policy_reference": "emergency_fallback",
+    },
+    required_approvals=[
+        ApprovalRequired(
+            role="Compliance Officer",
+            authority="Full manual review required",
+            sla_hours=4,
+        ),
+    ],
+    workflow_steps=[
+        WorkflowStepChecklist(
+            step_number=1,
+            action="HOLD for manual review",
+            responsible="System",
+            documentation_required="Error details",
+        ),
+    ],
+    audit_bundle={},
+    escalation_contacts={},
+    citations=[],
+)
+
 
 class FoundryAgentClient:
     """Client for interacting with Azure AI Foundry hosted agents."""
@@ -34,10 +96,21 @@ class FoundryAgentClient:
     def __init__(self):
         """Initialize the Foundry client."""
         self.settings = get_settings()
+        # Snapshot hot-path settings once; Settings is immutable after startup
+        settings = self.settings
+        self._max_retries = settings.max_retries
+        self._retry_delay = settings.retry_delay_seconds
+        self._backoff = settings.retry_backoff_factor
+        self._agent_sanctions = settings.azure_foundry_agent_sanctions
+        self._agent_liquidity = settings.azure_foundry_agent_liquidity
+        self._agent_procedures = settings.azure_foundry_agent_procedures
+        self._max_log_snippet = settings.max_log_snippet
         self._credential: Optional[DefaultAzureCredential] = None
         self._client: Optional[AIProjectClient] = None
         self._openai_client: Optional[AsyncAzureOpenAI] = None
         self._agents_cache: dict[str, dict] = {}  # name -> agent info
+        # Per-process counter for dry-run stub IDs only (never written for hosted runs)
+        self._stub_counter = itertools.count()
 
     async def _ensure_client(self) -> AIProjectClient:
         """Ensure client is initialized and return it."""
@@ -51,16 +124,27 @@ class FoundryAgentClient:
         return self._client
 
     async def close(self) -> None:
-        """Close client connections."""
-        if self._openai_client:
-            await self._openai_client.close()
-            self._openai_client = None
-        if self._client:
-            await self._client.close()
-            self._client = None
-        if self._credential:
-            await self._credential.close()
-            self._credential = None
+        """Close client connections.
+
+        The three teardowns are independent, so they run concurrently and are
+        bounded by a timeout so a slow TLS shutdown cannot block process exit.
+        """
+        closers = [
+            c.close()
+            for c in (self._openai_client, self._client, self._credential)
+            if c is not None
+        ]
+        self._openai_client = None
+        self._client = None
+        self._credential = None
+
+        if not closers:
+            return
+        try:
+            async with asyncio.timeout(5):
+                await asyncio.gather(*closers, return_exceptions=True)
+        except TimeoutError:
+            logger.warning("Timed out closing Foundry client connections")
 
     def _get_openai_client(self) -> AsyncAzureOpenAI:
         """Get an AsyncAzureOpenAI client for chat completions.
@@ -147,9 +231,9 @@ class FoundryAgentClient:
         """
         agent_info = await self._get_agent_info(agent_name)
 
-        max_retries = self.settings.max_retries
-        retry_delay = self.settings.retry_delay_seconds
-        backoff = self.settings.retry_backoff_factor
+        max_retries = self._max_retries
+        retry_delay = self._retry_delay
+        backoff = self._backoff
 
         last_error: Optional[Exception] = None
         tool_run_id = f"hosted-{agent_name}-{uuid.uuid4().hex[:8]}"
@@ -217,10 +301,10 @@ class FoundryAgentClient:
                 },
                 recommendation="REJECT payment immediately. Generate compliance case.",
                 pass_to_next_agent=False,
-                tool_run_id=f"stub-sanctions-{uuid.uuid4().hex[:8]}",
+                tool_run_id=f"stub-sanctions-{next(self._stub_counter):08x}",
                 audit={
-                    "run_id": f"stub-{uuid.uuid4().hex[:8]}",
-                    "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+                    "run_id": f"stub-{next(self._stub_counter):08x}",
+                    "timestamp_utc": _utcnow_iso(),
                     "index_queried": "idx-ofac-sdn-v1 (STUB)",
                 },
             )
@@ -234,10 +318,10 @@ class FoundryAgentClient:
             match_details=None,
             recommendation="No sanctions match. Payment may proceed to liquidity screening.",
             pass_to_next_agent=True,
-            tool_run_id=f"stub-sanctions-{uuid.uuid4().hex[:8]}",
+            tool_run_id=f"stub-sanctions-{next(self._stub_counter):08x}",
             audit={
-                "run_id": f"stub-{uuid.uuid4().hex[:8]}",
-                "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+                "run_id": f"stub-{next(self._stub_counter):08x}",
+                "timestamp_utc": _utcnow_iso(),
                 "index_queried": "idx-ofac-sdn-v1 (STUB)",
             },
         )
@@ -286,10 +370,10 @@ class FoundryAgentClient:
                 ] if breach else [],
             },
             pass_to_next_agent=True,
-            tool_run_id=f"stub-liquidity-{uuid.uuid4().hex[:8]}",
+            tool_run_id=f"stub-liquidity-{next(self._stub_counter):08x}",
             audit={
-                "run_id": f"stub-{uuid.uuid4().hex[:8]}",
-                "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+                "run_id": f"stub-{next(self._stub_counter):08x}",
+                "timestamp_utc": _utcnow_iso(),
                 "data_source": "PostgreSQL (STUB)",
                 "cutoff_time": "16:00",
             },
@@ -391,10 +475,10 @@ class FoundryAgentClient:
                     reference="policy_approval_matrix.md#authority-limits",
                 ),
             ],
-            tool_run_id=f"stub-procedures-{uuid.uuid4().hex[:8]}",
+            tool_run_id=f"stub-procedures-{next(self._stub_counter):08x}",
             audit={
-                "run_id": f"stub-{uuid.uuid4().hex[:8]}",
-                "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+                "run_id": f"stub-{next(self._stub_counter):08x}",
+                "timestamp_utc": _utcnow_iso(),
                 "policies_consulted": [
                     "runbook_emergency_payment.md",
                     "policy_approval_matrix.md",
@@ -423,7 +507,7 @@ class FoundryAgentClient:
         Returns:
             SanctionsResult with decision
         """
-        run_logger.set_context(step="sanctions", agent=self.settings.azure_foundry_agent_sanctions)
+        run_logger.set_context(step="sanctions", agent=self._agent_sanctions)
 
         # Dry-run mode
         if is_dry_run():
@@ -442,7 +526,7 @@ Please perform sanctions screening against the OFAC SDN list and return your ass
 
         try:
             response, tool_run_id = await self._run_agent_with_retry(
-                agent_name=self.settings.azure_foundry_agent_sanctions,
+                agent_name=self._agent_sanctions,
                 message=prompt,
                 run_logger=run_logger,
             )
@@ -455,15 +539,10 @@ Please perform sanctions screening against the OFAC SDN list and return your ass
         except Exception as e:
             run_logger.error(f"Sanctions screening failed: {e}")
             # Return ESCALATE on error (safe fallback)
-            return SanctionsResult(
-                beneficiary_screened=beneficiary_name,
-                decision=SanctionsDecision.ESCALATE,
-                confidence=0,
-                match_type="ERROR",
-                recommendation="System error - manual review required",
-                pass_to_next_agent=False,
-                audit={"error": str(e)},
-            )
+            return _ERROR_SANCTIONS_ESCALATE.model_copy(deep=True, update={
+                "beneficiary_screened": beneficiary_name,
+                "audit": {"error": str(e)},
+            })
 
     async def run_liquidity_screening(
         self,
@@ -479,7 +558,7 @@ Please perform sanctions screening against the OFAC SDN list and return your ass
         Returns:
             LiquidityResult with breach assessment
         """
-        run_logger.set_context(step="liquidity", agent=self.settings.azure_foundry_agent_liquidity)
+        run_logger.set_context(step="liquidity", agent=self._agent_liquidity)
 
         # Dry-run mode
         if is_dry_run():
@@ -503,7 +582,7 @@ Return your assessment as JSON.
 
         try:
             response, tool_run_id = await self._run_agent_with_retry(
-                agent_name=self.settings.azure_foundry_agent_liquidity,
+                agent_name=self._agent_liquidity,
                 message=prompt,
                 run_logger=run_logger,
             )
@@ -516,18 +595,11 @@ Return your assessment as JSON.
         except Exception as e:
             run_logger.error(f"Liquidity screening failed: {e}")
             # Return ESCALATE-triggering result on error
-            return LiquidityResult(
-                payment_assessed=payment_context,
-                breach_assessment={"breach": True, "error": str(e)},
-                account_summary={},
-                recommendation={
-                    "action": "ESCALATE",
-                    "reason": "System degradation - liquidity check unavailable",
-                    "alternatives": ["Manual liquidity verification required"],
-                },
-                pass_to_next_agent=True,
-                audit={"error": str(e), "degraded_mode": True},
-            )
+            return _ERROR_LIQUIDITY_DEGRADED.model_copy(deep=True, update={
+                "payment_assessed": payment_context,
+                "breach_assessment": {"breach": True, "error": str(e)},
+                "audit": {"error": str(e), "degraded_mode": True},
+            })
 
     async def run_operational_procedures(
         self,
@@ -547,7 +619,7 @@ Return your assessment as JSON.
         Returns:
             ProceduresResult with workflow determination
         """
-        run_logger.set_context(step="procedures", agent=self.settings.azure_foundry_agent_procedures)
+        run_logger.set_context(step="procedures", agent=self._agent_procedures)
 
         # Dry-run mode
         if is_dry_run():
@@ -566,10 +638,10 @@ Payment Request:
 {json.dumps(payment_context, indent=2)}
 
 Sanctions Screening Result:
-{json.dumps(sanctions_result.model_dump(), indent=2)}
+{sanctions_result.model_dump_json(indent=2)}
 
 Liquidity Screening Result:
-{json.dumps(liquidity_result.model_dump(), indent=2)}
+{liquidity_result.model_dump_json(indent=2)}
 
 Please query the treasury knowledge base and determine:
 1. Required approvers based on the decision matrix
@@ -582,7 +654,7 @@ Return your assessment as JSON with citations from the knowledge base.
 
         try:
             response, tool_run_id = await self._run_agent_with_retry(
-                agent_name=self.settings.azure_foundry_agent_procedures,
+                agent_name=self._agent_procedures,
                 message=prompt,
                 run_logger=run_logger,
             )
@@ -595,36 +667,14 @@ Return your assessment as JSON with citations from the knowledge base.
         except Exception as e:
             run_logger.error(f"Operational procedures failed: {e}")
             # Return safe HOLD on error
-            return ProceduresResult(
-                input_summary={
+            return _ERROR_PROCEDURES_HOLD.model_copy(deep=True, update={
+                "input_summary": {
                     "sanctions_decision": sanctions_result.decision.value,
                     "liquidity_breach": liquidity_result.breach_assessment.get("breach", False),
                 },
-                workflow_determination={
-                    "final_action": "HOLD",
-                    "reason": "System degradation - manual review required",
-                    "policy_reference": "emergency_fallback",
-                },
-                required_approvals=[
-                    ApprovalRequired(
-                        role="Compliance Officer",
-                        authority="Full manual review required",
-                        sla_hours=4,
-                    ),
-                ],
-                workflow_steps=[
-                    WorkflowStepChecklist(
-                        step_number=1,
-                        action="HOLD for manual review",
-                        responsible="System",
-                        documentation_required="Error details",
-                    ),
-                ],
-                audit_bundle={"error": str(e)},
-                escalation_contacts={},
-                citations=[],
-                audit={"error": str(e), "degraded_mode": True},
-            )
+                "audit_bundle": {"error": str(e)},
+                "audit": {"error": str(e), "degraded_mode": True},
+            })
 
     # =========================================================================
     # Response Parsing
@@ -662,7 +712,7 @@ Return your assessment as JSON with citations from the knowledge base.
                 recommendation="Parse error - manual review required",
                 pass_to_next_agent=False,
                 tool_run_id=tool_run_id,
-                audit={"parse_error": str(e), "raw_response": response[:500]},
+                audit={"parse_error": str(e), "raw_response": response[:self._max_log_snippet]},
             )
 
     def _parse_liquidity_response(
@@ -760,52 +810,59 @@ Return your assessment as JSON with citations from the knowledge base.
 
     def _extract_json(self, text: str) -> dict[str, Any]:
         """Extract JSON from text that may contain markdown code blocks or multiple JSON objects."""
-        import re
-
-        # Try direct parse first
+        # Try direct parse first (orjson parses the UTF-8 buffer without an intermediate copy)
+        # Only an object counts; a top-level array or scalar falls through to the search
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            data = orjson.loads(text)
+            if isinstance(data, dict):
+                return data
+        except orjson.JSONDecodeError:
             pass
 
         # Try to extract from code block
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+        json_match = _CODEBLOCK_RE.search(text)
         if json_match:
             try:
-                return json.loads(json_match.group(1))
+                data = _JSON_DECODER.decode(json_match.group(1))
+                if isinstance(data, dict):
+                    return data
             except json.JSONDecodeError:
                 pass
 
-        # Find all potential JSON objects by looking for balanced braces
-        # This handles cases where there are multiple JSON objects in the response
-        candidates = []
-        depth = 0
-        start_idx = -1
-
-        for i, char in enumerate(text):
-            if char == '{':
-                if depth == 0:
-                    start_idx = i
-                depth += 1
-            elif char == '}':
-                depth -= 1
-                if depth == 0 and start_idx != -1:
-                    candidate = text[start_idx:i + 1]
-                    try:
-                        parsed = json.loads(candidate)
-                        candidates.append(parsed)
-                    except json.JSONDecodeError:
-                        pass
-                    start_idx = -1
+        # Find all top-level JSON objects: jump to each '{' with str.find and let
+        # the C decoder consume the object (braces inside strings are handled)
+        candidates: list[tuple[dict[str, Any], int]] = []  # (object, span length)
+        pos = 0
+        malformed_at = -1  # Start of a '{' that failed to decode and may still be open
+
+        while True:
+            pos = text.find('{', pos)
+            if pos < 0:
+                break
+            if malformed_at >= 0:
+                # A '{' inside a malformed object is nested, never the agent's
+                # result; str.count keeps the brace balance check in C
+                if text.count('{', malformed_at, pos) > text.count('}', malformed_at, pos):
+                    pos += 1
+                    continue
+                malformed_at = -1
+            try:
+                parsed, end = _JSON_DECODER.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                malformed_at = pos
+                pos += 1
+                continue
+            candidates.append((parsed, end - pos))
+            pos = end
 
         # Return the best candidate (prefer one with 'decision' or 'agent' fields)
-        for candidate in candidates:
+        for candidate, _ in candidates:
             if 'decision' in candidate or 'agent' in candidate or 'workflow_determination' in candidate:
                 return candidate
 
-        # If no preferred candidate, return the largest one
+        # If no preferred candidate, return the largest one (by source span)
         if candidates:
-            return max(candidates, key=lambda x: len(str(x)))
+            return max(candidates, key=lambda c: c[1])[0]
 
         raise ValueError("No valid JSON found in response")
 
@@ -3,13 +3,15 @@ Structured logging configuration for the Emergency Payment Runbook.
 Provides JSON-formatted logs with trace context and PII redaction.
 """
 
-import json
 import logging
 import re
 import sys
+import time
+from contextvars import ContextVar, Token
 from datetime import datetime, timezone
 from typing import Any, Optional
-from functools import lru_cache
+
+import orjson
 
 from .config import get_settings
 
@@ -36,43 +38,115 @@ SENSITIVE_FIELDS = {
     'password', 'secret', 'token', 'api_key', 'apikey', 'authorization',
     'auth', 'credential', 'private_key', 'access_token', 'refresh_token',
 }
+# Single substring matcher over all sensitive field names
+_SENSITIVE_RE = re.compile("|".join(map(re.escape, sorted(SENSITIVE_FIELDS))))
+
+# Nested dicts beyond this depth are passed through untouched
+_MAX_REDACT_DEPTH = 10
+
+
+# All PII patterns fused into one alternation (same precedence order as
+# PII_PATTERNS) so each message is scanned once instead of once per pattern
+_PII_NAMES = ("EMAIL", "PHONE", "SSN", "CARD", "IBAN")
+_PII_COMBINED = re.compile("|".join(
+    f"(?P<{name}>{pattern.pattern})"
+    for name, (pattern, _) in zip(_PII_NAMES, PII_PATTERNS)
+))
+_PII_REPL = {
+    name: replacement
+    for name, (_, replacement) in zip(_PII_NAMES, PII_PATTERNS)
+}
+
+# Every PII pattern needs an "@" or a digit; text without either is skipped.
+# A single-class regex search beats str.translate / any(str.isdigit) scans on
+# typical log lines, so only the bound method is pre-resolved.
+_PII_PREFILTER = re.compile(r"[@0-9]")
+_has_pii_sentinel = _PII_PREFILTER.search
+
+
+def _pii_replacement(match: re.Match) -> str:
+    """Map a fused-pattern match to its redaction placeholder."""
+    return _PII_REPL[match.lastgroup]
+
+# Resolved once here and refreshed by setup_logging(), so the per-record
+# path does not go through get_settings()
+_REDACT_ENABLED: bool = get_settings().redact_pii
 
 
 def redact_pii(text: str) -> str:
     """Redact PII patterns from text."""
-    if not get_settings().redact_pii:
+    if not _REDACT_ENABLED:
         return text
+    if not _has_pii_sentinel(text):
+        return text
+
+    return _PII_COMBINED.sub(_pii_replacement, text)
 
-    for pattern, replacement in PII_PATTERNS:
-        text = pattern.sub(replacement, text)
 
-    return text
+def _is_clean_flat_dict(data: dict[str, Any]) -> bool:
+    """Check whether redaction would leave a dict unchanged without copying it."""
+    for key, value in data.items():
+        if _SENSITIVE_RE.search(key.lower()):
+            return False
+        if isinstance(value, (dict, list)):
+            return False
+        if isinstance(value, str) and _REDACT_ENABLED and _has_pii_sentinel(value):
+            return False
+    return True
 
 
 def redact_sensitive_dict(data: dict[str, Any], depth: int = 0) -> dict[str, Any]:
-    """Recursively redact sensitive fields from a dictionary."""
-    if depth > 10:  # Prevent infinite recursion
+    """Redact sensitive fields from a nested dictionary.
+
+    Walks the structure with an explicit work stack instead of recursion.
+    Dicts nested deeper than _MAX_REDACT_DEPTH levels are returned as-is
+    (guards against self-referencing payloads), as are flat dicts with no
+    sensitive keys and no PII candidates.
+    """
+    if depth > _MAX_REDACT_DEPTH:
+        return data
+    if _is_clean_flat_dict(data):
         return data
 
-    result = {}
-    for key, value in data.items():
-        key_lower = key.lower()
-
-        # Check if key is sensitive
-        if any(sensitive in key_lower for sensitive in SENSITIVE_FIELDS):
-            result[key] = '[REDACTED]'
-        elif isinstance(value, dict):
-            result[key] = redact_sensitive_dict(value, depth + 1)
-        elif isinstance(value, list):
-            result[key] = [
-                redact_sensitive_dict(item, depth + 1) if isinstance(item, dict)
-                else redact_pii(str(item)) if isinstance(item, str) else item
-                for item in value
-            ]
-        elif isinstance(value, str):
-            result[key] = redact_pii(value)
-        else:
-            result[key] = value
+    result: dict[str, Any] = {}
+    # (source dict, destination dict, nesting depth)
+    stack: list[tuple[dict[str, Any], dict[str, Any], int]] = [(data, result, depth)]
+
+    while stack:
+        source, dest, level = stack.pop()
+        child_level = level + 1
+        descend = child_level <= _MAX_REDACT_DEPTH
+
+        for key, value in source.items():
+            # Check if key is sensitive
+            if _SENSITIVE_RE.search(key.lower()):
+                dest[key] = '[REDACTED]'
+            elif isinstance(value, dict):
+                if descend:
+                    child: dict[str, Any] = {}
+                    stack.append((value, child, child_level))
+                    dest[key] = child
+                else:
+                    dest[key] = value
+            elif isinstance(value, list):
+                items = []
+                for item in value:
+                    if isinstance(item, dict):
+                        if descend:
+                            child = {}
+                            stack.append((item, child, child_level))
+                            items.append(child)
+                        else:
+                            items.append(item)
+                    elif isinstance(item, str):
+                        items.append(redact_pii(item))
+                    else:
+                        items.append(item)
+                dest[key] = items
+            elif isinstance(value, str):
+                dest[key] = redact_pii(value)
+            else:
+                dest[key] = value
 
     return result
 
@@ -81,6 +155,30 @@ def redact_sensitive_dict(data: dict[str, Any], depth: int = 0) -> dict[str, Any
 # Custom JSON Formatter
 # =============================================================================
 
+# Non-string keys in extra_data are stringified rather than rejected
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+# (epoch millisecond, formatted ISO timestamp) for back-to-back records;
+# swapped as a whole so threads never see a half-updated pair
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _iso_timestamp_ms(created: float) -> str:
+    """Format a record's creation time as ISO 8601 UTC at millisecond resolution.
+
+    Records created within the same millisecond reuse the cached string.
+    """
+    global _ts_cache
+    created_ms = int(created * 1000)
+    cached_ms, iso = _ts_cache
+    if cached_ms != created_ms:
+        iso = datetime.fromtimestamp(created_ms / 1000, timezone.utc).isoformat(
+            timespec="milliseconds"
+        )
+        _ts_cache = (created_ms, iso)
+    return iso
+
+
 class StructuredJSONFormatter(logging.Formatter):
     """JSON formatter with structured fields for observability."""
 
@@ -88,7 +186,7 @@ class StructuredJSONFormatter(logging.Formatter):
         """Format log record as JSON with trace context."""
         # Base log structure
         log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _iso_timestamp_ms(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": redact_pii(record.getMessage()),
@@ -97,25 +195,27 @@ class StructuredJSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add trace context if available
-        if hasattr(record, 'run_id'):
-            log_data['run_id'] = record.run_id
-        if hasattr(record, 'step'):
-            log_data['step'] = record.step
-        if hasattr(record, 'agent'):
-            log_data['agent'] = record.agent
-        if hasattr(record, 'elapsed_ms'):
-            log_data['elapsed_ms'] = record.elapsed_ms
+        # Add trace context if available (extra= fields land in __dict__)
+        attrs = record.__dict__
+        if 'run_id' in attrs:
+            log_data['run_id'] = attrs['run_id']
+        if 'step' in attrs:
+            log_data['step'] = attrs['step']
+        if 'agent' in attrs:
+            log_data['agent'] = attrs['agent']
+        if 'elapsed_ms' in attrs:
+            log_data['elapsed_ms'] = attrs['elapsed_ms']
 
         # Add extra fields (redacted)
-        if hasattr(record, 'extra_data') and record.extra_data:
-            log_data['data'] = redact_sensitive_dict(record.extra_data)
+        extra_data = attrs.get('extra_data')
+        if extra_data:
+            log_data['data'] = redact_sensitive_dict(extra_data)
 
         # Add exception info if present
         if record.exc_info:
             log_data['exception'] = self.formatException(record.exc_info)
 
-        return json.dumps(log_data, default=str)
+        return orjson.dumps(log_data, default=str, option=_ORJSON_OPTS).decode()
 
 
 class ColoredTextFormatter(logging.Formatter):
@@ -130,39 +230,94 @@ class ColoredTextFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # Colored, padded level label per known level
+        self._level_prefix = {
+            level: f"{color}{level:8}{self.RESET}"
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors."""
-        color = self.COLORS.get(record.levelname, self.RESET)
-        timestamp = datetime.now(timezone.utc).strftime('%H:%M:%S.%f')[:-3]
+        # Record creation time (UTC), not formatting time
+        timestamp = f"{time.strftime('%H:%M:%S', time.gmtime(record.created))}.{int(record.msecs):03d}"
 
         # Build prefix
-        prefix_parts = [f"{color}{record.levelname:8}{self.RESET}"]
-        if hasattr(record, 'run_id'):
-            prefix_parts.append(f"[{record.run_id[:8]}]")
-        if hasattr(record, 'step'):
-            prefix_parts.append(f"[{record.step}]")
-        if hasattr(record, 'agent'):
-            prefix_parts.append(f"[{record.agent}]")
+        attrs = record.__dict__
+        level_prefix = self._level_prefix.get(record.levelname)
+        if level_prefix is None:
+            level_prefix = f"{self.RESET}{record.levelname:8}{self.RESET}"
+        prefix_parts = [level_prefix]
+        if 'run_id' in attrs:
+            prefix_parts.append(f"[{attrs['run_id'][:8]}]")
+        if 'step' in attrs:
+            prefix_parts.append(f"[{attrs['step']}]")
+        if 'agent' in attrs:
+            prefix_parts.append(f"[{attrs['agent']}]")
 
         prefix = " ".join(prefix_parts)
         message = redact_pii(record.getMessage())
 
         # Add elapsed time if available
         suffix = ""
-        if hasattr(record, 'elapsed_ms'):
-            suffix = f" ({record.elapsed_ms}ms)"
+        if 'elapsed_ms' in attrs:
+            suffix = f" ({attrs['elapsed_ms']}ms)"
 
         return f"{timestamp} {prefix} {message}{suffix}"
 
 
+# =============================================================================
+# Run Context
+# =============================================================================
+
+# run_id of the workflow executing in the current task (copied into child tasks)
+_current_run_id: ContextVar[Optional[str]] = ContextVar("run_id", default=None)
+
+
+def bind_run(run_id: str) -> Token:
+    """Tag records logged in the current context with run_id.
+
+    Args:
+        run_id: Run identifier
+
+    Returns:
+        Token to pass to unbind_run() when the run's work is done
+    """
+    return _current_run_id.set(run_id)
+
+
+def unbind_run(token: Token) -> None:
+    """Restore the run context that was active before bind_run()."""
+    _current_run_id.reset(token)
+
+
+class RunContextFilter(logging.Filter):
+    """Add the bound run_id to records that do not carry one."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if 'run_id' not in record.__dict__:
+            run_id = _current_run_id.get()
+            if run_id is not None:
+                record.run_id = run_id
+        return True
+
+
 # =============================================================================
 # Logger Configuration
 # =============================================================================
 
-@lru_cache()
+_LOGGING_CONFIGURED = False
+
+
 def setup_logging() -> None:
-    """Configure application logging based on settings."""
+    """Configure application logging based on settings (runs once)."""
+    global _LOGGING_CONFIGURED, _REDACT_ENABLED
+    if _LOGGING_CONFIGURED:
+        return
+
     settings = get_settings()
+    _REDACT_ENABLED = settings.redact_pii
 
     # Get root logger
     root_logger = logging.getLogger()
@@ -174,6 +329,7 @@ def setup_logging() -> None:
     # Create handler
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(getattr(logging, settings.log_level.upper()))
+    handler.addFilter(RunContextFilter())
 
     # Set formatter based on settings
     if settings.log_format == "json":
@@ -188,6 +344,9 @@ def setup_logging() -> None:
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
 
+    # Only marked done once handlers are installed, so a failed attempt is retried
+    _LOGGING_CONFIGURED = True
+
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name."""
@@ -195,15 +354,27 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# Shared base logger for RunbookLogger, resolved on first use
+_runbook_logger: Optional[logging.Logger] = None
+
+
+def _get_runbook_logger() -> logging.Logger:
+    """Get the shared 'runbook' logger used by every RunbookLogger."""
+    global _runbook_logger
+    if _runbook_logger is None:
+        _runbook_logger = get_logger("runbook")
+    return _runbook_logger
+
+
 class RunbookLogger:
     """Context-aware logger for runbook operations."""
 
     def __init__(self, run_id: str, base_logger: Optional[logging.Logger] = None):
         self.run_id = run_id
-        self.logger = base_logger or get_logger("runbook")
+        self.logger = base_logger or _get_runbook_logger()
         self._step: Optional[str] = None
         self._agent: Optional[str] = None
-        self._start_time: Optional[datetime] = None
+        self._start_ns: Optional[int] = None
 
     def set_context(
         self,
@@ -218,14 +389,13 @@ class RunbookLogger:
 
     def start_timer(self) -> None:
         """Start elapsed time tracking."""
-        self._start_time = datetime.now(timezone.utc)
+        self._start_ns = time.monotonic_ns()
 
     def _get_elapsed_ms(self) -> int:
         """Get elapsed time in milliseconds."""
-        if self._start_time is None:
+        if self._start_ns is None:
             return 0
-        delta = datetime.now(timezone.utc) - self._start_time
-        return int(delta.total_seconds() * 1000)
+        return (time.monotonic_ns() - self._start_ns) // 1_000_000
 
     def _log(
         self,
@@ -235,13 +405,20 @@ class RunbookLogger:
         **kwargs: Any,
     ) -> None:
         """Internal logging method with context."""
-        extra = {
+        # Bail out before building extra/elapsed time for filtered-out levels
+        if not self.logger.isEnabledFor(level):
+            return
+        # Unset context is left off the record rather than logged as None
+        extra: dict[str, Any] = {
             'run_id': self.run_id,
-            'step': self._step,
-            'agent': self._agent,
             'elapsed_ms': self._get_elapsed_ms(),
-            'extra_data': extra_data,
         }
+        if self._step is not None:
+            extra['step'] = self._step
+        if self._agent is not None:
+            extra['agent'] = self._agent
+        if extra_data is not None:
+            extra['extra_data'] = extra_data
         self.logger.log(level, message, extra=extra, **kwargs)
 
     def debug(self, message: str, **kwargs: Any) -> None:
@@ -5,7 +5,7 @@ Main application entry point with API endpoints.
 
 import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Iterator
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
@@ -39,9 +39,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if is_dry_run():
         logger.warning("Running in DRY-RUN mode - agent responses will be stubbed")
 
+    # Background writers for deferred run status updates and SSE events
+    storage = get_storage()
+    writers = [
+        asyncio.create_task(storage.run_status_writer()),
+        asyncio.create_task(storage.run_event_writer()),
+    ]
+
     yield
 
     # Cleanup
+    for writer in writers:
+        writer.cancel()
+    for writer in writers:
+        try:
+            await writer
+        except asyncio.CancelledError:
+            pass
+    storage.close()
     from .foundry_client import get_foundry_client
     await get_foundry_client().close()
     logger.info("Application shutdown complete")
@@ -147,7 +162,7 @@ async def stream_runbook(run_id: str) -> StreamingResponse:
     """
     sse_manager = get_sse_manager()
 
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         try:
             async for event in sse_manager.subscribe(run_id):
                 yield event
@@ -226,15 +241,28 @@ async def list_runs(
     summary="Get run details",
     description="Returns detailed information about a specific workflow run including all events.",
 )
-async def get_run_detail(run_id: str) -> RunDetail:
-    """Get detailed information about a workflow run."""
+async def get_run_detail(run_id: str) -> StreamingResponse:
+    """Get detailed information about a workflow run.
+
+    The events array is streamed row by row from SQLite, so a long run is
+    never held in memory as a whole.
+    """
     storage = get_storage()
-    run = storage.get_run(run_id)
+    run = storage.get_run(run_id, include_events=False)
 
     if not run:
         raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
 
-    return run
+    def body() -> Iterator[bytes]:
+        # Splice the events array in place of the closing brace
+        yield run.model_dump_json(exclude={"events"}).encode()[:-1] + b',"events":['
+        separator = b""
+        for event in storage.iter_events(run_id):
+            yield separator + event.__pydantic_serializer__.to_json(event)
+            separator = b","
+        yield b"]}"
+
+    return StreamingResponse(body(), media_type="application/json")
 
 
 # =============================================================================
@@ -349,7 +377,7 @@ async def chat_endpoint(
         # Get SSE manager before starting workflow
         sse_manager = get_sse_manager()
 
-        async def event_generator() -> AsyncGenerator[str, None]:
+        async def event_generator() -> AsyncGenerator[bytes, None]:
             # Start workflow execution as a concurrent task
             # This allows events to be emitted while we stream them
             workflow_task = asyncio.create_task(orchestrator.execute_workflow(run_id))
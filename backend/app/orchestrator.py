@@ -6,15 +6,20 @@ Uses Microsoft Agent Framework for workflow orchestration with custom executors
 that wrap Azure AI Foundry hosted agents.
 """
 
+import asyncio
 import re
+import time
 import uuid
 from datetime import datetime, timezone
+from itertools import islice
 from typing import Any, Optional
 
 from .config import get_settings
 from .foundry_client import get_foundry_client, FoundryAgentClient
-from .logging_config import get_logger, RunbookLogger
+from .logging_config import bind_run, get_logger, unbind_run, RunbookLogger
 from .schemas import (
+    _new_payment_id,
+    _utcnow_iso,
     ApprovalRequired,
     Citation,
     DecisionPacket,
@@ -44,22 +49,132 @@ except ImportError:
 
 logger = get_logger("orchestrator")
 
+# Static agent_thinking context for sanctions screening (shared, never mutated)
+_SANCTIONS_LISTS_CTX = {"lists_checked": ("OFAC SDN", "EU Sanctions", "UN Sanctions")}
+
+# (finding_type, severity) of the sanctions finding emitted for each decision
+_SANCTIONS_FINDING_SPEC: dict[SanctionsDecision, tuple[str, str]] = {
+    SanctionsDecision.BLOCK: ("sanctions_match", "critical"),
+    SanctionsDecision.ESCALATE: ("potential_match", "warning"),
+    SanctionsDecision.CLEAR: ("sanctions_clear", "info"),
+}
+
+# Procedures final_action -> decision; the upper-case keys cover the usual agent output
+_DECISION_MAP: dict[str, FinalDecision] = {
+    "RELEASE": FinalDecision.RELEASE,
+    "PROCEED": FinalDecision.RELEASE,
+    "HOLD": FinalDecision.HOLD,
+    "PARTIAL": FinalDecision.PARTIAL,
+    "ESCALATE": FinalDecision.ESCALATE,
+    "REJECT": FinalDecision.REJECT,
+}
+
+# Static decision packet fragments, built once at import. The checklist and
+# approval models are frozen, so every packet can share the same instances.
+_BLOCK_CHECKLIST: tuple[WorkflowStepChecklist, ...] = (
+    WorkflowStepChecklist(
+        step_number=1,
+        action="REJECT payment immediately",
+        responsible="System (automatic)",
+        documentation_required="Sanctions match details, rejection timestamp",
+    ),
+    WorkflowStepChecklist(
+        step_number=2,
+        action="Generate compliance case",
+        responsible="Compliance Officer",
+        documentation_required="Full sanctions report, evidence package",
+    ),
+    WorkflowStepChecklist(
+        step_number=3,
+        action="File regulatory report if required",
+        responsible="MLRO",
+        documentation_required="SAR/STR as applicable",
+    ),
+)
+_BLOCK_APPROVALS: tuple[ApprovalRequired, ...] = (
+    ApprovalRequired(
+        role="Compliance Officer",
+        authority="Review and document sanctions match",
+        sla_hours=4,
+    ),
+)
+_BLOCK_SOD_CONSTRAINTS = ("No self-approval of compliance review",)
+_BLOCK_CUTOFF = ("Immediate rejection - no cutoff applicable",)
+_BASE_SOD_CONSTRAINTS = (
+    "Maker-checker separation required for approvals",
+    "No self-approval permitted",
+)
+
+
+def _span_timestamps(wall_start_ns: int, spans: list[tuple[str, int]]) -> dict[str, str]:
+    """Convert monotonic step offsets into ISO 8601 UTC timestamps.
+
+    Args:
+        wall_start_ns: Wall-clock time (ns since epoch) at offset 0
+        spans: (label, offset_ns) pairs recorded during the workflow
+
+    Returns:
+        Mapping of label to ISO timestamp
+    """
+    return {
+        label: datetime.fromtimestamp((wall_start_ns + offset_ns) / 1e9, timezone.utc).isoformat()
+        for label, offset_ns in spans
+    }
+
+
+async def _cancel_task(task: asyncio.Task) -> None:
+    """Cancel a helper task and wait for it to finish.
+
+    The task's own cancellation or failure is swallowed (its result is no
+    longer wanted); cancellation of the calling task still propagates.
+
+    Args:
+        task: Task to cancel
+    """
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        if asyncio.current_task().cancelling():
+            raise
+    except Exception:
+        pass
+
 
 class PaymentIntakeParser:
     """Parser for extracting payment details from user messages."""
 
     # Patterns for extracting payment information
-    # Match amounts like: $250,000, 100000, 50,000.00, etc.
-    AMOUNT_PATTERN = re.compile(
-        r'(?:\$\s*)?(\d{1,3}(?:,\d{3})+|\d{4,})(?:\.\d{2})?\s*(?:USD|EUR|TRY|GBP|dollars?)?',
+    # Amounts like $250,000, 100000, 50,000.00 and currency words, matched in
+    # one left-to-right scan (the alternatives never overlap: amounts start
+    # with "$" or a digit, currency words with a letter)
+    AMOUNT_CURRENCY_PATTERN = re.compile(
+        r'(?:\$\s*)?(?P<amount>\d{1,3}(?:,\d{3})+|\d{4,})(?:\.\d{2})?'
+        r'|\b(?P<currency>USD|EUR|TRY|GBP|dollars?|euros?|lira|pounds?)\b',
         re.IGNORECASE
     )
-    CURRENCY_PATTERN = re.compile(r'\b(USD|EUR|TRY|GBP|dollars?|euros?|lira|pounds?)\b', re.IGNORECASE)
+    # Currency words normalized to ISO codes
+    CURRENCY_ALIASES = {
+        'DOLLAR': 'USD', 'DOLLARS': 'USD',
+        'EURO': 'EUR', 'EUROS': 'EUR',
+        'LIRA': 'TRY',
+        'POUND': 'GBP', 'POUNDS': 'GBP',
+    }
     # Match beneficiary after "to" keyword
     BENEFICIARY_PATTERN = re.compile(
         r'\bto\s+([A-Z][A-Za-z0-9\s&.,\'-]+(?:LLC|Inc|Corp|Ltd|Co|Trading|Bank|Company)?)\s*$',
         re.IGNORECASE
     )
+    # Fallback: "to [Name]" anywhere in the message, up to a terminator
+    ALT_BENEFICIARY_PATTERN = re.compile(
+        r'\bto\s+([A-Z][A-Za-z0-9\s&.,\'-]+?)(?:\s+(?:for|from|amount|of|\$|USD|EUR|TRY|GBP|\d)|\.|,|$)',
+        re.IGNORECASE
+    )
+    TRAILING_NOISE_PATTERN = re.compile(r'\s+(for|from|amount|of)$', re.IGNORECASE)
+    # Company-like names (words followed by LLC, Inc, Corp, etc.)
+    COMPANY_PATTERN = re.compile(
+        r'\b([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+){0,3}\s+(?:LLC|Inc|Corp|Ltd|Co|Trading|Bank|Company))\b'
+    )
 
     @classmethod
     def parse(
@@ -78,13 +193,10 @@ class PaymentIntakeParser:
         """
         overrides = overrides or {}
 
-        # Extract amount
-        amount = cls._extract_amount(message)
+        # Extract amount and currency
+        amount, currency = cls._scan_amount_currency(message)
         if "amount" in overrides:
             amount = float(overrides["amount"])
-
-        # Extract currency
-        currency = cls._extract_currency(message)
         if "currency" in overrides:
             currency = overrides["currency"]
 
@@ -95,11 +207,11 @@ class PaymentIntakeParser:
 
         # Build PaymentRequest with defaults and overrides
         return PaymentRequest(
-            payment_id=overrides.get("payment_id", f"TXN-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6].upper()}"),
+            payment_id=overrides["payment_id"] if "payment_id" in overrides else _new_payment_id(),
             beneficiary_name=beneficiary,
             amount=amount,
             currency=currency,
-            timestamp_utc=overrides.get("timestamp_utc", datetime.now(timezone.utc).isoformat()),
+            timestamp_utc=overrides.get("timestamp_utc", _utcnow_iso()),
             entity=overrides.get("entity", "BankSubsidiary_TR"),
             account_id=overrides.get("account_id", "ACC-BAN-001"),
             channel=overrides.get("channel", "SWIFT"),
@@ -107,32 +219,25 @@ class PaymentIntakeParser:
         )
 
     @classmethod
-    def _extract_amount(cls, message: str) -> float:
-        """Extract payment amount from message."""
-        matches = cls.AMOUNT_PATTERN.findall(message)
-        if matches:
-            # Take the largest number found (likely the payment amount)
-            amounts = [float(m.replace(',', '')) for m in matches]
-            return max(amounts)
-        return 0.0
+    def _scan_amount_currency(cls, message: str) -> tuple[float, str]:
+        """Extract payment amount and currency from message in a single pass.
 
-    @classmethod
-    def _extract_currency(cls, message: str) -> str:
-        """Extract currency from message."""
-        match = cls.CURRENCY_PATTERN.search(message)
-        if match:
-            curr = match.group(1).upper()
-            # Normalize currency names
-            if curr in ('DOLLAR', 'DOLLARS'):
-                return 'USD'
-            if curr in ('EURO', 'EUROS'):
-                return 'EUR'
-            if curr in ('LIRA',):
-                return 'TRY'
-            if curr in ('POUND', 'POUNDS'):
-                return 'GBP'
-            return curr
-        return 'USD'  # Default
+        Returns:
+            The largest amount found (likely the payment amount, 0.0 if none)
+            and the first currency mentioned (USD if none)
+        """
+        amount = 0.0
+        currency = None
+        for match in cls.AMOUNT_CURRENCY_PATTERN.finditer(message):
+            digits = match.group('amount')
+            if digits is not None:
+                value = float(digits.replace(',', ''))
+                if value > amount:
+                    amount = value
+            elif currency is None:
+                curr = match.group('currency').upper()
+                currency = cls.CURRENCY_ALIASES.get(curr, curr)
+        return amount, currency or 'USD'
 
     @classmethod
     def _extract_beneficiary(cls, message: str) -> str:
@@ -142,18 +247,16 @@ class PaymentIntakeParser:
             return match.group(1).strip()
 
         # Alternative pattern: look for "to [Name]" anywhere in message
-        alt_pattern = re.compile(r'\bto\s+([A-Z][A-Za-z0-9\s&.,\'-]+?)(?:\s+(?:for|from|amount|of|\$|USD|EUR|TRY|GBP|\d)|\.|,|$)', re.IGNORECASE)
-        match = alt_pattern.search(message)
+        match = cls.ALT_BENEFICIARY_PATTERN.search(message)
         if match:
             name = match.group(1).strip()
             # Remove trailing noise words
-            name = re.sub(r'\s+(for|from|amount|of)$', '', name, flags=re.IGNORECASE)
+            name = cls.TRAILING_NOISE_PATTERN.sub('', name)
             if name and len(name) > 2:
                 return name
 
         # Fallback: look for company-like names (words with LLC, Inc, Corp, etc.)
-        company_pattern = re.compile(r'\b([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+){0,3}\s+(?:LLC|Inc|Corp|Ltd|Co|Trading|Bank|Company))\b')
-        match = company_pattern.search(message)
+        match = cls.COMPANY_PATTERN.search(message)
         if match:
             return match.group(1)
 
@@ -194,13 +297,12 @@ class WorkflowOrchestrator:
 
         # Parse payment from message
         # Filter out None values from overrides
-        overrides = {}
-        if request.overrides:
-            overrides = {k: v for k, v in request.overrides.model_dump().items() if v is not None}
+        overrides = request.overrides.model_dump(exclude_none=True) if request.overrides else {}
         payment = PaymentIntakeParser.parse(request.message, overrides)
 
-        # Create storage record
-        self.storage.create_run(
+        # Create storage record (SQLite write runs off the event loop)
+        await asyncio.to_thread(
+            self.storage.create_run,
             run_id=run_id,
             request_payload={
                 "message": request.message,
@@ -225,19 +327,26 @@ class WorkflowOrchestrator:
             Final DecisionPacket
         """
         run_logger = RunbookLogger(run_id)
-        timestamps: dict[str, str] = {}
+        # Step boundaries as monotonic offsets from one wall-clock anchor,
+        # only formatted once a decision packet is built
+        spans: list[tuple[str, int]] = []
+        liquidity_task: Optional[asyncio.Task] = None
+        run_token = bind_run(run_id)
 
         try:
             # Update status to running
-            self.storage.update_run_status(run_id, RunStatus.RUNNING)
+            self.storage.update_run_status_deferred(run_id, RunStatus.RUNNING)
 
             # Get run data
-            run_data = self.storage.get_run(run_id)
+            run_data = await asyncio.to_thread(self.storage.get_run, run_id)
             if not run_data:
                 raise ValueError(f"Run not found: {run_id}")
 
-            payment = PaymentRequest(**run_data.request_payload.get("payment", {}))
-            timestamps["workflow_started"] = datetime.now(timezone.utc).isoformat()
+            # Stored payload is a dump of the PaymentRequest validated at intake
+            payment = PaymentRequest.model_construct(**run_data.request_payload.get("payment", {}))
+            wall_start_ns = time.time_ns()
+            start_ns = time.monotonic_ns()
+            spans.append(("workflow_started", 0))
 
             # =================================================================
             # Step 1: Intake
@@ -263,17 +372,28 @@ class WorkflowOrchestrator:
                 result_data=payment_context,
             )
             run_logger.step_completed("intake", f"Parsed payment: {payment.payment_id}")
-            timestamps["intake_completed"] = datetime.now(timezone.utc).isoformat()
+            spans.append(("intake_completed", time.monotonic_ns() - start_ns))
+
+            # Liquidity does not depend on the sanctions outcome, so its agent
+            # call runs alongside screening (with its own logger context);
+            # its events are still streamed after the sanctions step
+            liquidity_task = asyncio.create_task(
+                self.foundry_client.run_liquidity_screening(
+                    payment_context=payment_context,
+                    run_logger=RunbookLogger(run_id),
+                )
+            )
 
             # =================================================================
             # Step 2: Sanctions Screening
             # =================================================================
+            agent_sanctions = self.settings.azure_foundry_agent_sanctions
             await self.sse_manager.step_started(
                 run_id,
                 WorkflowStep.SANCTIONS,
-                agent=self.settings.azure_foundry_agent_sanctions,
+                agent=agent_sanctions,
             )
-            run_logger.step_started("sanctions", self.settings.azure_foundry_agent_sanctions)
+            run_logger.step_started("sanctions", agent_sanctions)
 
             sanctions_result = await self.foundry_client.run_sanctions_screening(
                 beneficiary_name=payment.beneficiary_name,
@@ -281,274 +401,270 @@ class WorkflowOrchestrator:
                 run_logger=run_logger,
             )
 
-            # Emit detailed sanctions analysis traces
-            await self.sse_manager.agent_thinking(
-                run_id,
-                WorkflowStep.SANCTIONS,
-                self.settings.azure_foundry_agent_sanctions,
-                f"Screening beneficiary '{payment.beneficiary_name}' against sanctions lists",
-                context={"lists_checked": ["OFAC SDN", "EU Sanctions", "UN Sanctions"]},
-            )
-
-            # Emit screening details
-            await self.sse_manager.agent_detail(
-                run_id,
-                WorkflowStep.SANCTIONS,
-                self.settings.azure_foundry_agent_sanctions,
-                "Beneficiary Name",
-                payment.beneficiary_name,
-                category="info",
-            )
-            await self.sse_manager.agent_detail(
-                run_id,
-                WorkflowStep.SANCTIONS,
-                self.settings.azure_foundry_agent_sanctions,
-                "Match Type",
-                sanctions_result.match_type,
-                category="info",
-            )
-            await self.sse_manager.agent_detail(
-                run_id,
-                WorkflowStep.SANCTIONS,
-                self.settings.azure_foundry_agent_sanctions,
-                "Confidence Score",
-                f"{sanctions_result.confidence}%",
-                category="metric",
-            )
+            # Step events reach subscribers together when the block exits
+            async with self.sse_manager.batch(run_id):
+                # Emit detailed sanctions analysis traces
+                await self.sse_manager.agent_thinking(
+                    run_id,
+                    WorkflowStep.SANCTIONS,
+                    agent_sanctions,
+                    f"Screening beneficiary '{payment.beneficiary_name}' against sanctions lists",
+                    context=_SANCTIONS_LISTS_CTX,
+                )
 
-            # Emit finding based on decision
-            if sanctions_result.decision == SanctionsDecision.BLOCK:
-                match_details = sanctions_result.match_details or {}
-                await self.sse_manager.agent_finding(
+                # Emit screening details
+                await self.sse_manager.agent_detail(
+                    run_id,
+                    WorkflowStep.SANCTIONS,
+                    agent_sanctions,
+                    "Beneficiary Name",
+                    payment.beneficiary_name,
+                    category="info",
+                )
+                await self.sse_manager.agent_detail(
+                    run_id,
+                    WorkflowStep.SANCTIONS,
+                    agent_sanctions,
+                    "Match Type",
+                    sanctions_result.match_type,
+                    category="info",
+                )
+                await self.sse_manager.agent_detail(
                     run_id,
                     WorkflowStep.SANCTIONS,
-                    self.settings.azure_foundry_agent_sanctions,
-                    finding_type="sanctions_match",
-                    finding=f"BLOCKED: {sanctions_result.match_type} match found against SDN list",
-                    severity="critical",
-                    details={
+                    agent_sanctions,
+                    "Confidence Score",
+                    f"{sanctions_result.confidence}%",
+                    category="metric",
+                )
+
+                # Emit finding based on decision
+                finding_type, severity = _SANCTIONS_FINDING_SPEC[sanctions_result.decision]
+                if sanctions_result.decision is SanctionsDecision.BLOCK:
+                    match_details = sanctions_result.match_details or {}
+                    finding = f"BLOCKED: {sanctions_result.match_type} match found against SDN list"
+                    details = {
                         "matched_entity": match_details.get("matched_entity", payment.beneficiary_name),
                         "programs": match_details.get("programs", []),
                         "confidence": sanctions_result.confidence,
-                    },
-                )
-            elif sanctions_result.decision == SanctionsDecision.ESCALATE:
+                    }
+                elif sanctions_result.decision is SanctionsDecision.ESCALATE:
+                    finding = f"Potential match requires manual review (confidence: {sanctions_result.confidence}%)"
+                    details = {"recommendation": sanctions_result.recommendation}
+                else:
+                    finding = "No sanctions matches found - beneficiary cleared"
+                    details = {"confidence": sanctions_result.confidence}
+
                 await self.sse_manager.agent_finding(
                     run_id,
                     WorkflowStep.SANCTIONS,
-                    self.settings.azure_foundry_agent_sanctions,
-                    finding_type="potential_match",
-                    finding=f"Potential match requires manual review (confidence: {sanctions_result.confidence}%)",
-                    severity="warning",
-                    details={"recommendation": sanctions_result.recommendation},
+                    agent_sanctions,
+                    finding_type=finding_type,
+                    finding=finding,
+                    severity=severity,
+                    details=details,
                 )
-            else:
-                await self.sse_manager.agent_finding(
+
+                await self.sse_manager.tool_call(
                     run_id,
                     WorkflowStep.SANCTIONS,
-                    self.settings.azure_foundry_agent_sanctions,
-                    finding_type="sanctions_clear",
-                    finding="No sanctions matches found - beneficiary cleared",
-                    severity="info",
-                    details={"confidence": sanctions_result.confidence},
+                    agent_sanctions,
+                    "screen_sanctions",
+                    tool_run_id=sanctions_result.tool_run_id,
+                    output_summary=f"{sanctions_result.decision.value} ({sanctions_result.confidence}%)",
                 )
 
-            await self.sse_manager.tool_call(
-                run_id,
-                WorkflowStep.SANCTIONS,
-                self.settings.azure_foundry_agent_sanctions,
-                "screen_sanctions",
-                tool_run_id=sanctions_result.tool_run_id,
-                output_summary=f"{sanctions_result.decision.value} ({sanctions_result.confidence}%)",
-            )
-
-            # Build comprehensive result summary
-            result_summary = f"{sanctions_result.decision.value} ({sanctions_result.confidence}%)"
-            if sanctions_result.match_type != "NONE":
-                result_summary += f" | Match: {sanctions_result.match_type}"
-            result_summary += f" | {sanctions_result.recommendation[:60]}"
-
-            await self.sse_manager.step_completed(
-                run_id,
-                WorkflowStep.SANCTIONS,
-                agent=self.settings.azure_foundry_agent_sanctions,
-                result_summary=result_summary,
-                result_data={
-                    "decision": sanctions_result.decision.value,
-                    "confidence": sanctions_result.confidence,
-                    "match_type": sanctions_result.match_type,
-                    "recommendation": sanctions_result.recommendation,
-                },
-            )
-            run_logger.step_completed("sanctions", f"Decision: {sanctions_result.decision.value}")
-            timestamps["sanctions_completed"] = datetime.now(timezone.utc).isoformat()
+                # Build comprehensive result summary
+                summary_parts = [f"{sanctions_result.decision.value} ({sanctions_result.confidence}%)"]
+                if sanctions_result.match_type != "NONE":
+                    summary_parts.append(f"Match: {sanctions_result.match_type}")
+                summary_parts.append(sanctions_result.recommendation[:60])
+                result_summary = " | ".join(summary_parts)
 
-            # Check for BLOCK decision - stop workflow
-            if sanctions_result.decision == SanctionsDecision.BLOCK:
-                await self.sse_manager.branch(
+                await self.sse_manager.step_completed(
                     run_id,
                     WorkflowStep.SANCTIONS,
-                    "sanctions_decision == BLOCK",
-                    "TERMINATE",
-                    "Sanctions BLOCK requires immediate rejection",
+                    agent=agent_sanctions,
+                    result_summary=result_summary,
+                    result_data={
+                        "decision": sanctions_result.decision.value,
+                        "confidence": sanctions_result.confidence,
+                        "match_type": sanctions_result.match_type,
+                        "recommendation": sanctions_result.recommendation,
+                    },
                 )
-                run_logger.branch_taken("sanctions_decision == BLOCK", "TERMINATE")
+            run_logger.step_completed("sanctions", f"Decision: {sanctions_result.decision.value}")
+            spans.append(("sanctions_completed", time.monotonic_ns() - start_ns))
 
-                # Create decision packet for BLOCK
-                decision_packet = self._create_block_decision(
-                    run_id, payment, sanctions_result, timestamps
-                )
+            # Check for BLOCK decision - stop workflow
+            if sanctions_result.decision is SanctionsDecision.BLOCK:
+                await _cancel_task(liquidity_task)
+                # Branch and final events reach subscribers together, ahead of end_run
+                async with self.sse_manager.batch(run_id):
+                    await self.sse_manager.branch(
+                        run_id,
+                        WorkflowStep.SANCTIONS,
+                        "sanctions_decision == BLOCK",
+                        "TERMINATE",
+                        "Sanctions BLOCK requires immediate rejection",
+                    )
+                    run_logger.branch_taken("sanctions_decision == BLOCK", "TERMINATE")
 
-                await self._finalize_workflow(run_id, decision_packet, run_logger)
+                    # Create decision packet for BLOCK
+                    decision_packet = self._create_block_decision(
+                        run_id, payment, sanctions_result, _span_timestamps(wall_start_ns, spans)
+                    )
+
+                    await self._finalize_workflow(run_id, decision_packet, run_logger)
                 return decision_packet
 
             # =================================================================
             # Step 3: Liquidity Screening
             # =================================================================
+            agent_liquidity = self.settings.azure_foundry_agent_liquidity
             await self.sse_manager.step_started(
                 run_id,
                 WorkflowStep.LIQUIDITY,
-                agent=self.settings.azure_foundry_agent_liquidity,
+                agent=agent_liquidity,
             )
-            run_logger.step_started("liquidity", self.settings.azure_foundry_agent_liquidity)
+            run_logger.step_started("liquidity", agent_liquidity)
 
-            liquidity_result = await self.foundry_client.run_liquidity_screening(
-                payment_context=payment_context,
-                run_logger=run_logger,
-            )
+            liquidity_result = await liquidity_task
 
-            breach = liquidity_result.breach_assessment.get("breach", False)
             breach_assessment = liquidity_result.breach_assessment
+            breach = breach_assessment.get("breach", False)
             account_summary = liquidity_result.account_summary
 
-            # Emit detailed liquidity analysis traces
-            await self.sse_manager.agent_thinking(
-                run_id,
-                WorkflowStep.LIQUIDITY,
-                self.settings.azure_foundry_agent_liquidity,
-                f"Analyzing liquidity impact for {payment.currency} {payment.amount:,.2f} payment",
-                context={"entity": payment.entity, "account": payment.account_id},
-            )
-
-            # Emit account balance details
-            if account_summary:
-                await self.sse_manager.agent_detail(
-                    run_id,
-                    WorkflowStep.LIQUIDITY,
-                    self.settings.azure_foundry_agent_liquidity,
-                    "Start of Day Balance",
-                    f"${account_summary.get('start_of_day_balance', 0):,.2f}",
-                    category="metric",
-                )
-                await self.sse_manager.agent_detail(
-                    run_id,
-                    WorkflowStep.LIQUIDITY,
-                    self.settings.azure_foundry_agent_liquidity,
-                    "Total Outflows Today",
-                    f"${account_summary.get('total_outflow', 0):,.2f}",
-                    category="metric",
-                )
-                await self.sse_manager.agent_detail(
+            async with self.sse_manager.batch(run_id):
+                # Emit detailed liquidity analysis traces
+                await self.sse_manager.agent_thinking(
                     run_id,
                     WorkflowStep.LIQUIDITY,
-                    self.settings.azure_foundry_agent_liquidity,
-                    "Projected End of Day",
-                    f"${account_summary.get('end_of_day_balance', 0):,.2f}",
-                    category="metric",
+                    agent_liquidity,
+                    f"Analyzing liquidity impact for {payment.currency} {payment.amount:,.2f} payment",
+                    context={"entity": payment.entity, "account": payment.account_id},
                 )
 
-            # Emit buffer threshold comparison
-            if breach_assessment:
-                buffer_threshold = breach_assessment.get("buffer_threshold", 0)
-                projected_min = breach_assessment.get("projected_min_balance", 0)
-                headroom = breach_assessment.get("headroom", 0)
+                # Emit account balance details
+                if account_summary:
+                    await self.sse_manager.agent_detail(
+                        run_id,
+                        WorkflowStep.LIQUIDITY,
+                        agent_liquidity,
+                        "Start of Day Balance",
+                        f"${account_summary.get('start_of_day_balance', 0):,.2f}",
+                        category="metric",
+                    )
+                    await self.sse_manager.agent_detail(
+                        run_id,
+                        WorkflowStep.LIQUIDITY,
+                        agent_liquidity,
+                        "Total Outflows Today",
+                        f"${account_summary.get('total_outflow', 0):,.2f}",
+                        category="metric",
+                    )
+                    await self.sse_manager.agent_detail(
+                        run_id,
+                        WorkflowStep.LIQUIDITY,
+                        agent_liquidity,
+                        "Projected End of Day",
+                        f"${account_summary.get('end_of_day_balance', 0):,.2f}",
+                        category="metric",
+                    )
 
-                await self.sse_manager.agent_detail(
-                    run_id,
-                    WorkflowStep.LIQUIDITY,
-                    self.settings.azure_foundry_agent_liquidity,
-                    "Buffer Threshold",
-                    f"${buffer_threshold:,.2f}",
-                    category="threshold",
-                )
-                await self.sse_manager.agent_detail(
-                    run_id,
-                    WorkflowStep.LIQUIDITY,
-                    self.settings.azure_foundry_agent_liquidity,
-                    "Projected Minimum Balance",
-                    f"${projected_min:,.2f}",
-                    category="comparison",
-                )
+                # Emit buffer threshold comparison
+                if breach_assessment:
+                    buffer_threshold = breach_assessment.get("buffer_threshold", 0)
+                    projected_min = breach_assessment.get("projected_min_balance", 0)
+                    headroom = breach_assessment.get("headroom", 0)
 
-                # Emit finding based on breach status
-                if breach:
-                    gap = breach_assessment.get("gap", 0)
-                    first_breach_time = breach_assessment.get("first_breach_time", "unknown")
-                    await self.sse_manager.agent_finding(
+                    await self.sse_manager.agent_detail(
                         run_id,
                         WorkflowStep.LIQUIDITY,
-                        self.settings.azure_foundry_agent_liquidity,
-                        finding_type="liquidity_breach",
-                        finding=f"Payment would breach buffer threshold by ${gap:,.2f}",
-                        severity="critical",
-                        details={
-                            "gap_amount": gap,
-                            "breach_time": first_breach_time,
-                            "buffer_threshold": buffer_threshold,
-                            "projected_balance": projected_min,
-                        },
+                        agent_liquidity,
+                        "Buffer Threshold",
+                        f"${buffer_threshold:,.2f}",
+                        category="threshold",
                     )
-                else:
-                    await self.sse_manager.agent_finding(
+                    await self.sse_manager.agent_detail(
                         run_id,
                         WorkflowStep.LIQUIDITY,
-                        self.settings.azure_foundry_agent_liquidity,
-                        finding_type="liquidity_ok",
-                        finding=f"Sufficient headroom: ${headroom:,.2f} above buffer",
-                        severity="info",
-                        details={"headroom": headroom},
+                        agent_liquidity,
+                        "Projected Minimum Balance",
+                        f"${projected_min:,.2f}",
+                        category="comparison",
                     )
 
-            await self.sse_manager.tool_call(
-                run_id,
-                WorkflowStep.LIQUIDITY,
-                self.settings.azure_foundry_agent_liquidity,
-                "compute_liquidity_impact",
-                tool_run_id=liquidity_result.tool_run_id,
-                output_summary=f"{'BREACH' if breach else 'NO_BREACH'}",
-            )
+                    # Emit finding based on breach status
+                    if breach:
+                        gap = breach_assessment.get("gap", 0)
+                        first_breach_time = breach_assessment.get("first_breach_time", "unknown")
+                        await self.sse_manager.agent_finding(
+                            run_id,
+                            WorkflowStep.LIQUIDITY,
+                            agent_liquidity,
+                            finding_type="liquidity_breach",
+                            finding=f"Payment would breach buffer threshold by ${gap:,.2f}",
+                            severity="critical",
+                            details={
+                                "gap_amount": gap,
+                                "breach_time": first_breach_time,
+                                "buffer_threshold": buffer_threshold,
+                                "projected_balance": projected_min,
+                            },
+                        )
+                    else:
+                        await self.sse_manager.agent_finding(
+                            run_id,
+                            WorkflowStep.LIQUIDITY,
+                            agent_liquidity,
+                            finding_type="liquidity_ok",
+                            finding=f"Sufficient headroom: ${headroom:,.2f} above buffer",
+                            severity="info",
+                            details={"headroom": headroom},
+                        )
+
+                await self.sse_manager.tool_call(
+                    run_id,
+                    WorkflowStep.LIQUIDITY,
+                    agent_liquidity,
+                    "compute_liquidity_impact",
+                    tool_run_id=liquidity_result.tool_run_id,
+                    output_summary=f"{'BREACH' if breach else 'NO_BREACH'}",
+                )
 
-            # Build comprehensive result summary
-            result_summary = f"{'BREACH' if breach else 'OK'}"
-            if breach and breach_assessment.get("gap"):
-                result_summary += f" - Gap: ${breach_assessment.get('gap', 0):,.2f}"
-            result_summary += f" | {liquidity_result.recommendation.get('reason', '')[:80]}"
+                # Build comprehensive result summary
+                status = "BREACH" if breach else "OK"
+                if breach and breach_assessment.get("gap"):
+                    status = f"{status} - Gap: ${breach_assessment.get('gap', 0):,.2f}"
+                result_summary = " | ".join((status, liquidity_result.recommendation.get('reason', '')[:80]))
 
-            await self.sse_manager.step_completed(
-                run_id,
-                WorkflowStep.LIQUIDITY,
-                agent=self.settings.azure_foundry_agent_liquidity,
-                result_summary=result_summary,
-                result_data={
-                    "breach": breach,
-                    "gap": breach_assessment.get("gap", 0) if breach else 0,
-                    "buffer_threshold": breach_assessment.get("buffer_threshold", 0),
-                    "projected_balance": breach_assessment.get("projected_min_balance", 0),
-                    "recommendation": liquidity_result.recommendation.get("action", "UNKNOWN"),
-                },
-            )
+                await self.sse_manager.step_completed(
+                    run_id,
+                    WorkflowStep.LIQUIDITY,
+                    agent=agent_liquidity,
+                    result_summary=result_summary,
+                    result_data={
+                        "breach": breach,
+                        "gap": breach_assessment.get("gap", 0) if breach else 0,
+                        "buffer_threshold": breach_assessment.get("buffer_threshold", 0),
+                        "projected_balance": breach_assessment.get("projected_min_balance", 0),
+                        "recommendation": liquidity_result.recommendation.get("action", "UNKNOWN"),
+                    },
+                )
             run_logger.step_completed("liquidity", f"Breach: {breach}")
-            timestamps["liquidity_completed"] = datetime.now(timezone.utc).isoformat()
+            spans.append(("liquidity_completed", time.monotonic_ns() - start_ns))
 
             # =================================================================
             # Step 4: Operational Procedures
             # =================================================================
+            agent_procedures = self.settings.azure_foundry_agent_procedures
             await self.sse_manager.step_started(
                 run_id,
                 WorkflowStep.PROCEDURES,
-                agent=self.settings.azure_foundry_agent_procedures,
+                agent=agent_procedures,
             )
-            run_logger.step_started("procedures", self.settings.azure_foundry_agent_procedures)
+            run_logger.step_started("procedures", agent_procedures)
 
             procedures_result = await self.foundry_client.run_operational_procedures(
                 payment_context=payment_context,
@@ -557,157 +673,180 @@ class WorkflowOrchestrator:
                 run_logger=run_logger,
             )
 
-            # Emit detailed procedures analysis traces
-            await self.sse_manager.agent_thinking(
-                run_id,
-                WorkflowStep.PROCEDURES,
-                self.settings.azure_foundry_agent_procedures,
-                "Consulting treasury knowledge base for applicable policies and procedures",
-                context={
-                    "sanctions_decision": sanctions_result.decision.value,
-                    "liquidity_breach": breach,
-                    "amount": payment.amount,
-                },
-            )
-
-            # Log KB query if citations present
-            if procedures_result.citations:
-                await self.sse_manager.kb_query(
+            async with self.sse_manager.batch(run_id):
+                # Emit detailed procedures analysis traces
+                await self.sse_manager.agent_thinking(
                     run_id,
                     WorkflowStep.PROCEDURES,
-                    self.settings.azure_foundry_agent_procedures,
-                    "treasury policies and procedures",
-                    len(procedures_result.citations),
-                    [c.source for c in procedures_result.citations],
+                    agent_procedures,
+                    "Consulting treasury knowledge base for applicable policies and procedures",
+                    context={
+                        "sanctions_decision": sanctions_result.decision.value,
+                        "liquidity_breach": breach,
+                        "amount": payment.amount,
+                    },
                 )
-                # Emit details for each citation
-                for citation in procedures_result.citations[:3]:  # Limit to first 3
-                    await self.sse_manager.agent_detail(
+
+                # Log KB query if citations present
+                if procedures_result.citations:
+                    await self.sse_manager.kb_query(
                         run_id,
                         WorkflowStep.PROCEDURES,
-                        self.settings.azure_foundry_agent_procedures,
-                        f"Policy: {citation.source}",
-                        citation.snippet[:100] + "..." if len(citation.snippet) > 100 else citation.snippet,
-                        category="info",
+                        agent_procedures,
+                        "treasury policies and procedures",
+                        len(procedures_result.citations),
+                        [c.source for c in procedures_result.citations],
                     )
-
-            final_action = procedures_result.workflow_determination.get("final_action", "HOLD")
-            reason = procedures_result.workflow_determination.get("reason", "")
-            policy_ref = procedures_result.workflow_determination.get("policy_reference", "")
-
-            # Emit workflow determination details
-            await self.sse_manager.agent_detail(
-                run_id,
-                WorkflowStep.PROCEDURES,
-                self.settings.azure_foundry_agent_procedures,
-                "Determined Action",
-                final_action,
-                category="info",
-            )
-            if policy_ref:
+                    # Emit details for each citation
+                    for citation in islice(procedures_result.citations, 3):  # Limit to first 3
+                        await self.sse_manager.agent_detail(
+                            run_id,
+                            WorkflowStep.PROCEDURES,
+                            agent_procedures,
+                            f"Policy: {citation.source}",
+                            citation.snippet[:100] + "..." if len(citation.snippet) > 100 else citation.snippet,
+                            category="info",
+                        )
+
+                determination = procedures_result.workflow_determination
+                final_action = determination.get("final_action", "HOLD")
+                reason = determination.get("reason", "")
+                policy_ref = determination.get("policy_reference", "")
+
+                # Emit workflow determination details
                 await self.sse_manager.agent_detail(
                     run_id,
                     WorkflowStep.PROCEDURES,
-                    self.settings.azure_foundry_agent_procedures,
-                    "Policy Reference",
-                    policy_ref,
+                    agent_procedures,
+                    "Determined Action",
+                    final_action,
                     category="info",
                 )
+                if policy_ref:
+                    await self.sse_manager.agent_detail(
+                        run_id,
+                        WorkflowStep.PROCEDURES,
+                        agent_procedures,
+                        "Policy Reference",
+                        policy_ref,
+                        category="info",
+                    )
 
-            # Emit required approvals
-            if procedures_result.required_approvals:
-                approvers = [a.role for a in procedures_result.required_approvals]
-                await self.sse_manager.agent_finding(
-                    run_id,
-                    WorkflowStep.PROCEDURES,
-                    self.settings.azure_foundry_agent_procedures,
-                    finding_type="approvals_required",
-                    finding=f"Required approvals: {', '.join(approvers)}",
-                    severity="warning" if len(approvers) > 1 else "info",
-                    details={
-                        "approvers": [
-                            {"role": a.role, "authority": a.authority, "sla_hours": a.sla_hours}
-                            for a in procedures_result.required_approvals
-                        ]
-                    },
-                )
+                # Emit required approvals
+                if procedures_result.required_approvals:
+                    approvers = [a.role for a in procedures_result.required_approvals]
+                    await self.sse_manager.agent_finding(
+                        run_id,
+                        WorkflowStep.PROCEDURES,
+                        agent_procedures,
+                        finding_type="approvals_required",
+                        finding=f"Required approvals: {', '.join(approvers)}",
+                        severity="warning" if len(approvers) > 1 else "info",
+                        details={
+                            "approvers": [
+                                {"role": a.role, "authority": a.authority, "sla_hours": a.sla_hours}
+                                for a in procedures_result.required_approvals
+                            ]
+                        },
+                    )
 
-            # Emit workflow steps summary
-            if procedures_result.workflow_steps:
-                await self.sse_manager.agent_finding(
+                # Emit workflow steps summary
+                if procedures_result.workflow_steps:
+                    await self.sse_manager.agent_finding(
+                        run_id,
+                        WorkflowStep.PROCEDURES,
+                        agent_procedures,
+                        finding_type="procedure_steps",
+                        finding=f"{len(procedures_result.workflow_steps)} operational steps identified",
+                        severity="info",
+                        details={
+                            "steps": [
+                                {"step": s.step_number, "action": s.action, "responsible": s.responsible}
+                                for s in procedures_result.workflow_steps
+                            ]
+                        },
+                    )
+
+                # Build comprehensive result summary
+                summary_parts = [str(final_action)]
+                if reason:
+                    summary_parts.append(reason[:80])
+                if procedures_result.required_approvals:
+                    summary_parts.append(f"{len(procedures_result.required_approvals)} approvals needed")
+                result_summary = " | ".join(summary_parts)
+
+                await self.sse_manager.step_completed(
                     run_id,
                     WorkflowStep.PROCEDURES,
-                    self.settings.azure_foundry_agent_procedures,
-                    finding_type="procedure_steps",
-                    finding=f"{len(procedures_result.workflow_steps)} operational steps identified",
-                    severity="info",
-                    details={
-                        "steps": [
-                            {"step": s.step_number, "action": s.action, "responsible": s.responsible}
-                            for s in procedures_result.workflow_steps
-                        ]
+                    agent=agent_procedures,
+                    result_summary=result_summary,
+                    result_data={
+                        "final_action": final_action,
+                        "reason": reason,
+                        "policy_reference": policy_ref,
+                        "approvals_count": len(procedures_result.required_approvals),
+                        "steps_count": len(procedures_result.workflow_steps),
+                        "citations_count": len(procedures_result.citations),
                     },
                 )
-
-            # Build comprehensive result summary
-            result_summary = f"{final_action}"
-            if reason:
-                result_summary += f" | {reason[:80]}"
-            if procedures_result.required_approvals:
-                result_summary += f" | {len(procedures_result.required_approvals)} approvals needed"
-
-            await self.sse_manager.step_completed(
-                run_id,
-                WorkflowStep.PROCEDURES,
-                agent=self.settings.azure_foundry_agent_procedures,
-                result_summary=result_summary,
-                result_data={
-                    "final_action": final_action,
-                    "reason": reason,
-                    "policy_reference": policy_ref,
-                    "approvals_count": len(procedures_result.required_approvals),
-                    "steps_count": len(procedures_result.workflow_steps),
-                    "citations_count": len(procedures_result.citations),
-                },
-            )
             run_logger.step_completed("procedures", f"Action: {final_action}")
-            timestamps["procedures_completed"] = datetime.now(timezone.utc).isoformat()
+            spans.append(("procedures_completed", time.monotonic_ns() - start_ns))
 
             # =================================================================
             # Step 5: Summarize and Finalize
             # =================================================================
-            await self.sse_manager.step_started(run_id, WorkflowStep.SUMMARIZE)
-            run_logger.step_started("summarize")
-
-            decision_packet = self._create_decision_packet(
-                run_id=run_id,
-                payment=payment,
-                sanctions_result=sanctions_result,
-                liquidity_result=liquidity_result,
-                procedures_result=procedures_result,
-                timestamps=timestamps,
-            )
+            async with self.sse_manager.batch(run_id):
+                await self.sse_manager.step_started(run_id, WorkflowStep.SUMMARIZE)
+                run_logger.step_started("summarize")
+
+                decision_packet = self._create_decision_packet(
+                    run_id=run_id,
+                    payment=payment,
+                    sanctions_result=sanctions_result,
+                    liquidity_result=liquidity_result,
+                    procedures_result=procedures_result,
+                    timestamps=_span_timestamps(wall_start_ns, spans),
+                )
 
-            await self._finalize_workflow(run_id, decision_packet, run_logger)
+                await self._finalize_workflow(run_id, decision_packet, run_logger)
             return decision_packet
 
         except Exception as e:
             run_logger.error(f"Workflow failed: {e}")
 
+            await self._fail_run(run_id, e)
+            raise
+
+        finally:
+            try:
+                # Also reached when the workflow itself is cancelled
+                if liquidity_task is not None and not liquidity_task.done():
+                    await _cancel_task(liquidity_task)
+            finally:
+                unbind_run(run_token)
+
+    async def _fail_run(self, run_id: str, exc: Exception) -> None:
+        """Record a failed run and close its SSE stream.
+
+        Args:
+            run_id: Run identifier
+            exc: Exception that aborted the workflow
+        """
+        error_message = str(exc)
+        self.storage.update_run_status_deferred(run_id, RunStatus.FAILED, error=error_message)
+
+        # Error event and end signal reach subscribers in a single write
+        async with self.sse_manager.batch(run_id):
             await self.sse_manager.error(
                 run_id,
                 WorkflowStep.SUMMARIZE,
                 "orchestrator",
-                str(e),
-                error_type=type(e).__name__,
+                error_message,
+                error_type=type(exc).__name__,
                 recoverable=False,
             )
-
-            self.storage.update_run_status(run_id, RunStatus.FAILED, error=str(e))
             await self.sse_manager.end_run(run_id)
 
-            raise
-
     async def _finalize_workflow(
         self,
         run_id: str,
@@ -715,15 +854,16 @@ class WorkflowOrchestrator:
         run_logger: RunbookLogger,
     ) -> None:
         """Finalize the workflow with decision and cleanup."""
-        # Save decision
-        self.storage.save_decision(run_id, decision_packet)
+        # Dumped once, off the event loop, for both the stored packet and the final event
+        packet_data = await asyncio.to_thread(decision_packet.model_dump, mode="json")
 
-        # Emit final event
+        # Persist before announcing: a failed save must not follow a FINAL event
+        await asyncio.to_thread(self.storage.save_decision, run_id, decision_packet, packet_data)
         await self.sse_manager.final(
             run_id=run_id,
             decision=decision_packet.decision.value,
             summary=decision_packet.rationale[0] if decision_packet.rationale else "",
-            decision_packet=decision_packet.model_dump(),
+            decision_packet=packet_data,
         )
 
         run_logger.step_completed("summarize", f"Final decision: {decision_packet.decision.value}")
@@ -741,7 +881,7 @@ class WorkflowOrchestrator:
         timestamps: dict[str, str],
     ) -> DecisionPacket:
         """Create decision packet for sanctions BLOCK."""
-        timestamps["workflow_completed"] = datetime.now(timezone.utc).isoformat()
+        timestamps["workflow_completed"] = _utcnow_iso()
 
         return DecisionPacket(
             run_id=run_id,
@@ -753,35 +893,10 @@ class WorkflowOrchestrator:
                 f"Confidence: {sanctions_result.confidence}%",
                 "Immediate rejection required per compliance policy",
             ],
-            procedure_checklist=[
-                WorkflowStepChecklist(
-                    step_number=1,
-                    action="REJECT payment immediately",
-                    responsible="System (automatic)",
-                    documentation_required="Sanctions match details, rejection timestamp",
-                ),
-                WorkflowStepChecklist(
-                    step_number=2,
-                    action="Generate compliance case",
-                    responsible="Compliance Officer",
-                    documentation_required="Full sanctions report, evidence package",
-                ),
-                WorkflowStepChecklist(
-                    step_number=3,
-                    action="File regulatory report if required",
-                    responsible="MLRO",
-                    documentation_required="SAR/STR as applicable",
-                ),
-            ],
-            approvals_required=[
-                ApprovalRequired(
-                    role="Compliance Officer",
-                    authority="Review and document sanctions match",
-                    sla_hours=4,
-                ),
-            ],
-            sod_constraints=["No self-approval of compliance review"],
-            cutoff_actions=["Immediate rejection - no cutoff applicable"],
+            procedure_checklist=_BLOCK_CHECKLIST,
+            approvals_required=_BLOCK_APPROVALS,
+            sod_constraints=_BLOCK_SOD_CONSTRAINTS,
+            cutoff_actions=_BLOCK_CUTOFF,
             citations=[
                 Citation(
                     source="OFAC SDN List",
@@ -808,19 +923,12 @@ class WorkflowOrchestrator:
         timestamps: dict[str, str],
     ) -> DecisionPacket:
         """Create final decision packet from workflow results."""
-        timestamps["workflow_completed"] = datetime.now(timezone.utc).isoformat()
+        timestamps["workflow_completed"] = _utcnow_iso()
 
         # Map final action to decision
-        final_action = procedures_result.workflow_determination.get("final_action", "HOLD")
-        decision_map = {
-            "RELEASE": FinalDecision.RELEASE,
-            "PROCEED": FinalDecision.RELEASE,
-            "HOLD": FinalDecision.HOLD,
-            "PARTIAL": FinalDecision.PARTIAL,
-            "ESCALATE": FinalDecision.ESCALATE,
-            "REJECT": FinalDecision.REJECT,
-        }
-        decision = decision_map.get(final_action.upper(), FinalDecision.HOLD)
+        determination = procedures_result.workflow_determination
+        final_action = determination.get("final_action", "HOLD")
+        decision = _DECISION_MAP.get(final_action) or _DECISION_MAP.get(final_action.upper(), FinalDecision.HOLD)
 
         # Build rationale
         breach = liquidity_result.breach_assessment.get("breach", False)
@@ -828,14 +936,11 @@ class WorkflowOrchestrator:
             f"Sanctions screening: {sanctions_result.decision.value} ({sanctions_result.confidence}% confidence)",
             f"Liquidity assessment: {'BREACH detected' if breach else 'No breach'}",
             f"Final action: {final_action}",
-            procedures_result.workflow_determination.get("reason", ""),
+            determination.get("reason", ""),
         ]
 
         # Extract SoD constraints
-        sod_constraints = [
-            "Maker-checker separation required for approvals",
-            "No self-approval permitted",
-        ]
+        sod_constraints = list(_BASE_SOD_CONSTRAINTS)
         if payment.amount > 250000:
             sod_constraints.append("Dual approval required for amounts > USD 250,000")
 
@@ -843,7 +948,7 @@ class WorkflowOrchestrator:
         cutoff_actions = []
         if breach:
             cutoff_actions.append("Payment held pending liquidity resolution")
-        if decision == FinalDecision.HOLD:
+        if decision is FinalDecision.HOLD:
             cutoff_actions.append("Cutoff extension may be requested with Treasury Manager approval")
 
         return DecisionPacket(
@@ -891,17 +996,18 @@ class WorkflowOrchestrator:
             )
 
         run_logger = RunbookLogger(run_id)
+        run_token = bind_run(run_id)
 
         try:
             # Update status to running
-            self.storage.update_run_status(run_id, RunStatus.RUNNING)
+            self.storage.update_run_status_deferred(run_id, RunStatus.RUNNING)
 
             # Get run data
-            run_data = self.storage.get_run(run_id)
+            run_data = await asyncio.to_thread(self.storage.get_run, run_id)
             if not run_data:
                 raise ValueError(f"Run not found: {run_id}")
 
-            payment = PaymentRequest(**run_data.request_payload.get("payment", {}))
+            payment = PaymentRequest.model_construct(**run_data.request_payload.get("payment", {}))
 
             # Create workflow
             workflow = create_emergency_payment_workflow(
@@ -913,7 +1019,7 @@ class WorkflowOrchestrator:
             initial_state = EmergencyPaymentState(
                 run_id=run_id,
                 payment=payment,
-                timestamps={"workflow_started": datetime.now(timezone.utc).isoformat()},
+                timestamps={"workflow_started": _utcnow_iso()},
             )
 
             logger.info(f"Starting agent-framework workflow for run: {run_id}")
@@ -921,7 +1027,7 @@ class WorkflowOrchestrator:
             # Run workflow
             async for event in workflow.run(initial_state):
                 # Process workflow events
-                logger.debug(f"Workflow event: {type(event).__name__}")
+                logger.debug("Workflow event: %s", type(event).__name__)
 
             # Get final output from workflow
             # The SummarizeExecutor yields the DecisionPacket
@@ -930,9 +1036,9 @@ class WorkflowOrchestrator:
             if decision_packet is None:
                 raise RuntimeError("Workflow completed without producing DecisionPacket")
 
-            # Finalize
-            self.storage.save_decision(run_id, decision_packet)
-            self.storage.update_run_status(run_id, RunStatus.COMPLETED)
+            # Finalize (SQLite writes run off the event loop)
+            await asyncio.to_thread(self.storage.save_decision, run_id, decision_packet)
+            await asyncio.to_thread(self.storage.update_run_status, run_id, RunStatus.COMPLETED)
             await self.sse_manager.end_run(run_id)
 
             logger.info(f"Agent-framework workflow completed: {run_id} -> {decision_packet.decision.value}")
@@ -941,20 +1047,12 @@ class WorkflowOrchestrator:
         except Exception as e:
             run_logger.error(f"Agent-framework workflow failed: {e}")
 
-            await self.sse_manager.error(
-                run_id,
-                WorkflowStep.SUMMARIZE,
-                "orchestrator",
-                str(e),
-                error_type=type(e).__name__,
-                recoverable=False,
-            )
-
-            self.storage.update_run_status(run_id, RunStatus.FAILED, error=str(e))
-            await self.sse_manager.end_run(run_id)
-
+            await self._fail_run(run_id, e)
             raise
 
+        finally:
+            unbind_run(run_token)
+
 
 # Singleton orchestrator instance
 _orchestrator: Optional[WorkflowOrchestrator] = None
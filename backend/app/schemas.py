@@ -3,11 +3,44 @@ Pydantic schemas for the Emergency Payment Runbook API.
 Defines all request/response models and internal data structures.
 """
 
-from datetime import datetime
 from enum import Enum
 from typing import Any, Optional
-from pydantic import BaseModel, Field
-import uuid
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from pydantic_core import to_json
+import secrets
+import time
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") reused by timestamps within that second
+_iso_second_cache: tuple[int, str] = (-1, "")
+
+
+def _utcnow_naive_iso() -> str:
+    """Return the current UTC time in ``datetime.utcnow().isoformat()`` form.
+
+    Only the microsecond suffix is formatted per call; the date/time prefix
+    is cached per second.
+    """
+    global _iso_second_cache
+    t = time.time()
+    second = int(t)
+    if _iso_second_cache[0] != second:
+        _iso_second_cache = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+    return f"{_iso_second_cache[1]}.{int((t - second) * 1_000_000):06d}"
+
+
+def _utcnow_iso() -> str:
+    """Return the current UTC time as an ISO 8601 string (microsecond precision).
+
+    Equivalent to ``datetime.now(timezone.utc).isoformat()`` but avoids building
+    a datetime object; shares the per-second prefix cache above.
+    """
+    return _utcnow_naive_iso() + "+00:00"
+
+
+def _new_payment_id() -> str:
+    """Generate a payment ID of the form ``TXN-YYYYMMDDHHMMSS-XXXXXX``."""
+    return f"TXN-{time.strftime('%Y%m%d%H%M%S', time.gmtime())}-{secrets.token_hex(3).upper()}"
 
 
 # =============================================================================
@@ -93,11 +126,13 @@ class RunbookStartRequest(BaseModel):
 
 class PaymentRequest(BaseModel):
     """Normalized payment request extracted from user message."""
-    payment_id: str = Field(default_factory=lambda: f"TXN-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:6].upper()}")
+    model_config = ConfigDict(frozen=True)
+
+    payment_id: str = Field(default_factory=_new_payment_id)
     beneficiary_name: str = Field(..., description="Name of the payment beneficiary")
     amount: float = Field(..., gt=0, description="Payment amount")
     currency: str = Field(default="USD", description="Payment currency code")
-    timestamp_utc: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp_utc: str = Field(default_factory=_utcnow_naive_iso)
     entity: str = Field(default="BankSubsidiary_TR", description="Originating entity")
     account_id: str = Field(default="ACC-BAN-001", description="Source account ID")
     channel: str = Field(default="SWIFT", description="Payment channel")
@@ -106,6 +141,8 @@ class PaymentRequest(BaseModel):
 
 class Citation(BaseModel):
     """Citation reference from agent responses."""
+    model_config = ConfigDict(frozen=True)
+
     source: str = Field(..., description="Source document or system")
     snippet: str = Field(..., description="Relevant text snippet")
     reference: str = Field(..., description="Reference identifier or URL")
@@ -113,6 +150,8 @@ class Citation(BaseModel):
 
 class ApprovalRequired(BaseModel):
     """Required approval for payment processing."""
+    model_config = ConfigDict(frozen=True)
+
     role: str = Field(..., description="Approver role")
     authority: str = Field(..., description="What they are authorized to approve")
     sla_hours: int = Field(..., description="SLA for approval in hours")
@@ -120,6 +159,8 @@ class ApprovalRequired(BaseModel):
 
 class WorkflowStepChecklist(BaseModel):
     """Checklist item for procedure steps."""
+    model_config = ConfigDict(frozen=True)
+
     step_number: int
     action: str
     responsible: str
@@ -182,19 +223,32 @@ class RunbookStartResponse(BaseModel):
 
 class SSEEvent(BaseModel):
     """Server-Sent Event structure for workflow progress."""
+    model_config = ConfigDict(frozen=True)
+
     run_id: str
     seq: int
     type: EventType
     step: WorkflowStep
     agent: str
-    ts: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
+    ts: str = Field(default_factory=_utcnow_naive_iso)
     elapsed_ms: int = 0
     payload: dict[str, Any] = Field(default_factory=dict)
 
-    def to_sse(self) -> str:
-        """Convert to SSE data format."""
-        import json
-        return f"data: {json.dumps(self.model_dump())}\n\n"
+    _sse_frame: Optional[bytes] = PrivateAttr(default=None)
+
+    def payload_json(self) -> bytes:
+        """Return the payload as JSON bytes."""
+        return to_json(self.payload)
+
+    def to_sse(self) -> bytes:
+        """Convert to an SSE data frame (UTF-8 bytes, ready to write).
+
+        The frame is serialized once by pydantic-core and reused for every
+        subscriber; events are not modified after they are emitted.
+        """
+        if self._sse_frame is None:
+            self._sse_frame = b"data: " + self.__pydantic_serializer__.to_json(self) + b"\n\n"
+        return self._sse_frame
 
 
 class DecisionPacket(BaseModel):
@@ -4,31 +4,43 @@ Handles real-time streaming of workflow progress to clients.
 """
 
 import asyncio
+import itertools
 import json
-from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
 from collections import defaultdict
 
 from .schemas import EventType, SSEEvent, WorkflowStep
-from .storage import get_storage
+from .storage import get_storage, RunbookStorage
 from .logging_config import get_logger
 
 logger = get_logger("sse")
 
+# Frames a subscriber may fall behind by before it is disconnected
+SUBSCRIBER_QUEUE_SIZE = 256
+
 
 class SSEManager:
     """Manages SSE event streams for workflow runs."""
 
-    def __init__(self):
-        """Initialize SSE manager."""
+    def __init__(self, storage: Optional[RunbookStorage] = None):
+        """Initialize SSE manager.
+
+        Args:
+            storage: Storage for event persistence
+        """
+        self.storage = storage or get_storage()
         # Queues for each run_id to stream events
-        self._queues: dict[str, list[asyncio.Queue]] = defaultdict(list)
+        self._queues: dict[str, set[asyncio.Queue]] = defaultdict(set)
         # Sequence counters for each run
-        self._sequences: dict[str, int] = defaultdict(int)
-        # Start times for elapsed calculation
-        self._start_times: dict[str, datetime] = {}
-        # Lock for thread safety
-        self._lock = asyncio.Lock()
+        self._sequences: dict[str, itertools.count] = defaultdict(lambda: itertools.count(1))
+        # Monotonic start times (ns) for elapsed calculation
+        self._start_times: dict[str, int] = {}
+        # Buffered SSE frames for runs inside a batch() block
+        self._batches: dict[str, list[bytes]] = {}
+        # No lock: all state is only touched from the event loop, and no
+        # mutation below spans an await
 
     async def start_run(self, run_id: str) -> None:
         """Initialize tracking for a new run.
@@ -36,25 +48,23 @@ class SSEManager:
         Args:
             run_id: Unique run identifier
         """
-        async with self._lock:
-            self._sequences[run_id] = 0
-            self._start_times[run_id] = datetime.now(timezone.utc)
-            self._queues[run_id] = []
-            logger.debug(f"SSE manager started tracking run: {run_id}")
+        self._sequences[run_id] = itertools.count(1)
+        self._start_times[run_id] = time.monotonic_ns()
+        self._queues[run_id] = set()
+        logger.debug(f"SSE manager started tracking run: {run_id}")
 
-    async def subscribe(self, run_id: str) -> AsyncGenerator[str, None]:
+    async def subscribe(self, run_id: str) -> AsyncGenerator[bytes, None]:
         """Subscribe to SSE events for a run.
 
         Args:
             run_id: Run identifier to subscribe to
 
         Yields:
-            SSE formatted event strings
+            SSE formatted event frames
         """
-        queue: asyncio.Queue = asyncio.Queue()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
 
-        async with self._lock:
-            self._queues[run_id].append(queue)
+        self._queues[run_id].add(queue)
 
         logger.debug(f"New SSE subscriber for run: {run_id}")
 
@@ -71,12 +81,12 @@ class SSEManager:
 
                 except asyncio.TimeoutError:
                     # Send heartbeat to keep connection alive
-                    yield ": heartbeat\n\n"
+                    yield b": heartbeat\n\n"
 
         finally:
-            async with self._lock:
-                if run_id in self._queues and queue in self._queues[run_id]:
-                    self._queues[run_id].remove(queue)
+            queues = self._queues.get(run_id)
+            if queues:
+                queues.discard(queue)
             logger.debug(f"SSE subscriber disconnected from run: {run_id}")
 
     async def emit(
@@ -99,17 +109,15 @@ class SSEManager:
         Returns:
             The emitted SSEEvent
         """
-        async with self._lock:
-            # Increment sequence
-            self._sequences[run_id] += 1
-            seq = self._sequences[run_id]
+        # Next sequence number
+        seq = next(self._sequences[run_id])
 
-            # Calculate elapsed time
-            start_time = self._start_times.get(run_id, datetime.now(timezone.utc))
-            elapsed_ms = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
+        # Calculate elapsed time
+        now_ns = time.monotonic_ns()
+        elapsed_ms = (now_ns - self._start_times.get(run_id, now_ns)) // 1_000_000
 
-        # Create event
-        event = SSEEvent(
+        # Create event (every field is produced here, so validation is skipped)
+        event = SSEEvent.model_construct(
             run_id=run_id,
             seq=seq,
             type=event_type,
@@ -121,45 +129,84 @@ class SSEManager:
 
         # Persist event
         try:
-            get_storage().save_event(event)
+            self.storage.save_event_deferred(event)
         except Exception as e:
             logger.warning(f"Failed to persist event: {e}")
 
-        # Broadcast to subscribers
+        # Broadcast to subscribers (or hold until the open batch is flushed)
         sse_data = event.to_sse()
+        batch = self._batches.get(run_id)
+        if batch is not None:
+            batch.append(sse_data)
+        else:
+            self._broadcast(run_id, sse_data)
 
-        async with self._lock:
-            queues = self._queues.get(run_id, [])
-            for queue in queues:
-                try:
-                    await queue.put(sse_data)
-                except Exception as e:
-                    logger.warning(f"Failed to enqueue event: {e}")
-
-        logger.debug(f"Emitted event: {event_type.value} for run {run_id}")
+        logger.debug("Emitted event: %s for run %s", event_type.value, run_id)
         return event
 
+    def _broadcast(self, run_id: str, sse_data: bytes) -> None:
+        """Put SSE formatted data on every subscriber queue for a run."""
+        # Synchronous fan-out over a snapshot; slow subscribers are discarded mid-loop
+        for queue in tuple(self._queues.get(run_id, ())):
+            try:
+                queue.put_nowait(sse_data)
+            except asyncio.QueueFull:
+                # A client this far behind is dropped rather than buffered without bound
+                self._queues[run_id].discard(queue)
+                self._close_queue(queue)
+                logger.warning(
+                    f"Dropped slow SSE subscriber for run: {run_id} "
+                    f"({SUBSCRIBER_QUEUE_SIZE} frames behind)"
+                )
+
+    @staticmethod
+    def _close_queue(queue: asyncio.Queue) -> None:
+        """Put the end signal on a subscriber queue, discarding its backlog if full."""
+        try:
+            queue.put_nowait(None)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    @asynccontextmanager
+    async def batch(self, run_id: str) -> AsyncIterator[None]:
+        """Deliver events emitted inside the block to subscribers in one write.
+
+        Events still get their own sequence numbers and are persisted as they
+        are emitted; only the subscriber queue puts are deferred until exit.
+
+        Args:
+            run_id: Run identifier
+        """
+        buffer: list[bytes] = []
+        self._batches[run_id] = buffer
+        try:
+            yield
+        finally:
+            self._batches.pop(run_id, None)
+            if buffer:
+                self._broadcast(run_id, b"".join(buffer))
+
     async def end_run(self, run_id: str) -> None:
         """Signal end of run to all subscribers.
 
         Args:
             run_id: Run identifier
         """
-        async with self._lock:
-            queues = self._queues.get(run_id, [])
-            for queue in queues:
-                try:
-                    await queue.put(None)  # End signal
-                except Exception:
-                    pass
-
-            # Cleanup
-            if run_id in self._queues:
-                del self._queues[run_id]
-            if run_id in self._sequences:
-                del self._sequences[run_id]
-            if run_id in self._start_times:
-                del self._start_times[run_id]
+        # Frames held by an enclosing batch() go out ahead of the end signal
+        batch = self._batches.get(run_id)
+        if batch:
+            self._broadcast(run_id, b"".join(batch))
+            batch.clear()
+
+        # Cleanup first, then signal the detached queues
+        queues = self._queues.pop(run_id, ())
+        self._sequences.pop(run_id, None)
+        self._start_times.pop(run_id, None)
+
+        for queue in queues:
+            self._close_queue(queue)
 
         logger.debug(f"SSE manager ended run: {run_id}")
 
@@ -3,13 +3,16 @@ SQLite persistence layer for the Emergency Payment Runbook.
 Stores workflow runs, events, and decision packets.
 """
 
-import json
+import asyncio
 import sqlite3
+import threading
 from contextlib import contextmanager
-from datetime import datetime, timezone
-from typing import Any, Generator, Optional
+from typing import Any, Generator, Iterator, Optional
+
+import orjson
 
 from .schemas import (
+    _utcnow_iso,
     DecisionPacket,
     EventType,
     FinalDecision,
@@ -23,6 +26,59 @@ from .logging_config import get_logger
 
 logger = get_logger("storage")
 
+# Per-connection settings, applied when a thread opens its connection.
+# synchronous=NORMAL is durable across application crashes in WAL mode.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Write statements, kept as constants so each connection's statement cache
+# compiles them once
+_INSERT_RUN_SQL = """
+    INSERT INTO runs (run_id, status, request_payload, created_at)
+    VALUES (?, ?, ?, ?)
+"""
+_FINISH_RUN_SQL = """
+    UPDATE runs
+    SET status = ?, error = ?, completed_at = ?
+    WHERE run_id = ?
+"""
+_UPDATE_OPEN_RUN_SQL = """
+    UPDATE runs
+    SET status = ?, error = ?
+    WHERE run_id = ? AND completed_at IS NULL
+"""
+_SAVE_DECISION_SQL = """
+    UPDATE runs
+    SET decision = ?, decision_packet = ?, status = ?, completed_at = ?
+    WHERE run_id = ?
+"""
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (run_id, seq, type, step, agent, ts, elapsed_ms, payload)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+
+def _event_from_row(row: sqlite3.Row) -> SSEEvent:
+    """Rebuild an SSEEvent from an events row.
+
+    Rows were written from validated events, so the model is constructed
+    without re-validating each field.
+    """
+    return SSEEvent.model_construct(
+        run_id=row["run_id"],
+        seq=row["seq"],
+        type=EventType(row["type"]),
+        step=WorkflowStep(row["step"]),
+        agent=row["agent"],
+        ts=row["ts"],
+        elapsed_ms=row["elapsed_ms"],
+        payload=orjson.loads(row["payload"]),
+    )
 
 class RunbookStorage:
     """SQLite storage for runbook workflow data."""
@@ -35,6 +91,17 @@ class RunbookStorage:
         """
         # Extract path from URL
         self.db_path = database_url.replace("sqlite:///", "")
+        # One long-lived connection per thread (event loop and to_thread workers),
+        # registered so close() can reach the ones opened on other threads
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        # Bumped by close() so threads reopen instead of reusing a closed connection
+        self._generation = 0
+        # Write-behind queue for run status updates (set while run_status_writer runs)
+        self._status_queue: Optional[asyncio.Queue] = None
+        # Write-behind queue for SSE events (set while run_event_writer runs)
+        self._event_queue: Optional[asyncio.Queue] = None
         self._init_database()
 
     def _init_database(self) -> None:
@@ -42,6 +109,10 @@ class RunbookStorage:
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL lets readers run alongside the event writer; the mode is
+            # stored in the database file, so it only needs setting once
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Runs table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS runs (
@@ -73,8 +144,10 @@ class RunbookStorage:
             """)
 
             # Create indexes for performance
+            # (run_id, seq) serves run_id lookups, ORDER BY seq and MAX(seq)
+            # without a sort step
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_events_run_id ON events(run_id)
+                CREATE INDEX IF NOT EXISTS idx_events_run_seq ON events(run_id, seq)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_runs_created_at ON runs(created_at DESC)
@@ -88,13 +161,42 @@ class RunbookStorage:
 
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get database connection context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's database connection, opening it on first use.
+
+        A failed block has its open transaction rolled back so the connection
+        is clean for the next caller.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            # Only this thread uses the connection; close() may run elsewhere
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+            self._local.generation = self._generation
         try:
             yield conn
-        finally:
-            conn.close()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close every connection opened by this storage.
+
+        Closing the last connection checkpoints the WAL and removes the
+        -wal/-shm files. Later calls transparently open new connections.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to close database connection: {e}")
 
     # =========================================================================
     # Run Operations
@@ -110,15 +212,12 @@ class RunbookStorage:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO runs (run_id, status, request_payload, created_at)
-                VALUES (?, ?, ?, ?)
-                """,
+                _INSERT_RUN_SQL,
                 (
                     run_id,
                     RunStatus.PENDING.value,
-                    json.dumps(request_payload),
-                    datetime.now(timezone.utc).isoformat(),
+                    orjson.dumps(request_payload).decode(),
+                    _utcnow_iso(),
                 ),
             )
             conn.commit()
@@ -137,67 +236,128 @@ class RunbookStorage:
             status: New status
             error: Optional error message
         """
+        self._apply_status_updates(
+            [(run_id, status, error, _utcnow_iso())]
+        )
+        logger.debug(f"Updated run status: {run_id} -> {status.value}")
+
+    def update_run_status_deferred(
+        self,
+        run_id: str,
+        status: RunStatus,
+        error: Optional[str] = None,
+    ) -> None:
+        """Queue a run status update for the background writer.
+
+        Falls back to a synchronous update when run_status_writer is not
+        running (e.g. outside the application lifespan).
+
+        Args:
+            run_id: Run identifier
+            status: New status
+            error: Optional error message
+        """
+        if self._status_queue is None:
+            self.update_run_status(run_id, status, error)
+            return
+        self._status_queue.put_nowait(
+            (run_id, status, error, _utcnow_iso())
+        )
+
+    async def run_status_writer(self, batch_window: float = 0.01) -> None:
+        """Drain deferred status updates, one transaction per batch.
+
+        Runs until cancelled; updates still queued at that point are flushed
+        before returning.
+
+        Args:
+            batch_window: Seconds to wait for more updates after the first
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        self._status_queue = queue
+        batch: list[tuple[str, RunStatus, Optional[str], str]] = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                await asyncio.sleep(batch_window)
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                # Handed off before awaiting so a cancelled write is not repeated
+                pending, batch = batch, []
+                try:
+                    await asyncio.to_thread(self._apply_status_updates, pending)
+                except Exception as e:
+                    logger.warning(f"Failed to persist {len(pending)} status updates: {e}")
+        finally:
+            self._status_queue = None
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                self._apply_status_updates(batch)
+
+    def _apply_status_updates(
+        self,
+        updates: list[tuple[str, RunStatus, Optional[str], str]],
+    ) -> None:
+        """Write (run_id, status, error, timestamp) updates in one transaction."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            if status in (RunStatus.COMPLETED, RunStatus.FAILED):
-                cursor.execute(
-                    """
-                    UPDATE runs
-                    SET status = ?, error = ?, completed_at = ?
-                    WHERE run_id = ?
-                    """,
-                    (
-                        status.value,
-                        error,
-                        datetime.now(timezone.utc).isoformat(),
-                        run_id,
-                    ),
-                )
-            else:
-                cursor.execute(
-                    """
-                    UPDATE runs
-                    SET status = ?, error = ?
-                    WHERE run_id = ?
-                    """,
-                    (status.value, error, run_id),
-                )
+            for run_id, status, error, updated_at in updates:
+                if status in (RunStatus.COMPLETED, RunStatus.FAILED):
+                    cursor.execute(
+                        _FINISH_RUN_SQL,
+                        (status.value, error, updated_at, run_id),
+                    )
+                else:
+                    # A late non-terminal update must not reopen a finished run
+                    cursor.execute(
+                        _UPDATE_OPEN_RUN_SQL,
+                        (status.value, error, run_id),
+                    )
 
             conn.commit()
-            logger.debug(f"Updated run status: {run_id} -> {status.value}")
 
-    def save_decision(self, run_id: str, decision_packet: DecisionPacket) -> None:
+    def save_decision(
+        self,
+        run_id: str,
+        decision_packet: DecisionPacket,
+        packet_data: Optional[dict[str, Any]] = None,
+    ) -> None:
         """Save final decision packet.
 
         Args:
             run_id: Run identifier
             decision_packet: Final decision data
+            packet_data: decision_packet.model_dump(mode="json") if the caller already has it
         """
+        if packet_data is None:
+            packet_json = decision_packet.model_dump_json()
+        else:
+            packet_json = orjson.dumps(packet_data).decode()
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                UPDATE runs
-                SET decision = ?, decision_packet = ?, status = ?, completed_at = ?
-                WHERE run_id = ?
-                """,
+                _SAVE_DECISION_SQL,
                 (
                     decision_packet.decision.value,
-                    json.dumps(decision_packet.model_dump()),
+                    packet_json,
                     RunStatus.COMPLETED.value,
-                    datetime.now(timezone.utc).isoformat(),
+                    _utcnow_iso(),
                     run_id,
                 ),
             )
             conn.commit()
             logger.info(f"Saved decision for run {run_id}: {decision_packet.decision.value}")
 
-    def get_run(self, run_id: str) -> Optional[RunDetail]:
+    def get_run(self, run_id: str, include_events: bool = True) -> Optional[RunDetail]:
         """Get run details by ID.
 
         Args:
             run_id: Run identifier
+            include_events: Load the run's events (callers streaming them
+                via iter_events() pass False)
 
         Returns:
             RunDetail if found, None otherwise
@@ -212,32 +372,21 @@ class RunbookStorage:
             if not row:
                 return None
 
-            # Get events
-            cursor.execute(
-                "SELECT * FROM events WHERE run_id = ? ORDER BY seq",
-                (run_id,),
-            )
-            event_rows = cursor.fetchall()
-
-            events = [
-                SSEEvent(
-                    run_id=e["run_id"],
-                    seq=e["seq"],
-                    type=EventType(e["type"]),
-                    step=WorkflowStep(e["step"]),
-                    agent=e["agent"],
-                    ts=e["ts"],
-                    elapsed_ms=e["elapsed_ms"],
-                    payload=json.loads(e["payload"]),
+            # Get events (rows are converted as SQLite steps through them,
+            # rather than after a fetchall() copy)
+            events = []
+            if include_events:
+                cursor.execute(
+                    "SELECT * FROM events WHERE run_id = ? ORDER BY seq",
+                    (run_id,),
                 )
-                for e in event_rows
-            ]
+                events = [_event_from_row(e) for e in cursor]
 
             # Parse decision packet if exists
             decision_packet = None
             if row["decision_packet"]:
                 try:
-                    dp_data = json.loads(row["decision_packet"])
+                    dp_data = orjson.loads(row["decision_packet"])
                     decision_packet = DecisionPacket(**dp_data)
                 except Exception as e:
                     logger.warning(f"Failed to parse decision packet: {e}")
@@ -245,7 +394,7 @@ class RunbookStorage:
             return RunDetail(
                 run_id=row["run_id"],
                 status=RunStatus(row["status"]),
-                request_payload=json.loads(row["request_payload"]),
+                request_payload=orjson.loads(row["request_payload"]),
                 decision_packet=decision_packet,
                 events=events,
                 created_at=row["created_at"],
@@ -274,7 +423,7 @@ class RunbookStorage:
                 return None
 
             try:
-                dp_data = json.loads(row["decision_packet"])
+                dp_data = orjson.loads(row["decision_packet"])
                 return DecisionPacket(**dp_data)
             except Exception as e:
                 logger.warning(f"Failed to parse decision packet: {e}")
@@ -296,13 +445,18 @@ class RunbookStorage:
         Returns:
             List of run history items
         """
+        # The history fields are read from the stored payload by SQLite's
+        # json_extract, so rows are never decoded in Python
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
             if status:
                 cursor.execute(
                     """
-                    SELECT run_id, status, decision, request_payload, created_at, completed_at
+                    SELECT run_id, status, decision, created_at, completed_at,
+                        json_extract(request_payload, '$.payment.beneficiary_name') AS beneficiary,
+                        json_extract(request_payload, '$.payment.amount') AS amount,
+                        json_extract(request_payload, '$.payment.currency') AS currency
                     FROM runs
                     WHERE status = ?
                     ORDER BY created_at DESC
@@ -313,7 +467,10 @@ class RunbookStorage:
             else:
                 cursor.execute(
                     """
-                    SELECT run_id, status, decision, request_payload, created_at, completed_at
+                    SELECT run_id, status, decision, created_at, completed_at,
+                        json_extract(request_payload, '$.payment.beneficiary_name') AS beneficiary,
+                        json_extract(request_payload, '$.payment.amount') AS amount,
+                        json_extract(request_payload, '$.payment.currency') AS currency
                     FROM runs
                     ORDER BY created_at DESC
                     LIMIT ? OFFSET ?
@@ -323,25 +480,19 @@ class RunbookStorage:
 
             rows = cursor.fetchall()
 
-            items = []
-            for row in rows:
-                request_data = json.loads(row["request_payload"])
-                payment = request_data.get("payment", {})
-
-                items.append(
-                    RunHistoryItem(
-                        run_id=row["run_id"],
-                        status=RunStatus(row["status"]),
-                        decision=FinalDecision(row["decision"]) if row["decision"] else None,
-                        beneficiary=payment.get("beneficiary_name"),
-                        amount=payment.get("amount"),
-                        currency=payment.get("currency"),
-                        created_at=row["created_at"],
-                        completed_at=row["completed_at"],
-                    )
+            return [
+                RunHistoryItem(
+                    run_id=row["run_id"],
+                    status=RunStatus(row["status"]),
+                    decision=FinalDecision(row["decision"]) if row["decision"] else None,
+                    beneficiary=row["beneficiary"],
+                    amount=row["amount"],
+                    currency=row["currency"],
+                    created_at=row["created_at"],
+                    completed_at=row["completed_at"],
                 )
-
-            return items
+                for row in rows
+            ]
 
     # =========================================================================
     # Event Operations
@@ -353,26 +504,83 @@ class RunbookStorage:
         Args:
             event: Event to save
         """
+        self.save_events([event])
+
+    def save_events(self, events: list[SSEEvent]) -> None:
+        """Save SSE events to the database in one transaction.
+
+        Args:
+            events: Events to save
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO events (run_id, seq, type, step, agent, ts, elapsed_ms, payload)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event.run_id,
-                    event.seq,
-                    event.type.value,
-                    event.step.value,
-                    event.agent,
-                    event.ts,
-                    event.elapsed_ms,
-                    json.dumps(event.payload),
-                ),
+            cursor.executemany(
+                _INSERT_EVENT_SQL,
+                [
+                    (
+                        event.run_id,
+                        event.seq,
+                        event.type.value,
+                        event.step.value,
+                        event.agent,
+                        event.ts,
+                        event.elapsed_ms,
+                        event.payload_json().decode(),
+                    )
+                    for event in events
+                ],
             )
             conn.commit()
 
+    def save_event_deferred(self, event: SSEEvent) -> None:
+        """Queue an SSE event for the background writer.
+
+        Falls back to a synchronous insert when run_event_writer is not
+        running or its queue is full.
+
+        Args:
+            event: Event to save
+        """
+        if self._event_queue is not None:
+            try:
+                self._event_queue.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                logger.warning("Event write queue full, saving event inline")
+        self.save_event(event)
+
+    async def run_event_writer(self, max_batch: int = 256, max_pending: int = 10_000) -> None:
+        """Drain deferred SSE events, one transaction per batch.
+
+        Events queued while a batch is being written form the next batch.
+        Runs until cancelled; events still queued at that point are flushed
+        before returning.
+
+        Args:
+            max_batch: Maximum number of events per transaction
+            max_pending: Queue size beyond which events are saved inline
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._event_queue = queue
+        batch: list[SSEEvent] = []
+        try:
+            while True:
+                batch.append(await queue.get())
+                while len(batch) < max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                # Handed off before awaiting so a cancelled write is not repeated
+                pending, batch = batch, []
+                try:
+                    await asyncio.to_thread(self.save_events, pending)
+                except Exception as e:
+                    logger.warning(f"Failed to persist {len(pending)} events: {e}")
+        finally:
+            self._event_queue = None
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                self.save_events(batch)
+
     def get_events(self, run_id: str) -> list[SSEEvent]:
         """Get all events for a run.
 
@@ -388,21 +596,32 @@ class RunbookStorage:
                 "SELECT * FROM events WHERE run_id = ? ORDER BY seq",
                 (run_id,),
             )
-            rows = cursor.fetchall()
+            return [_event_from_row(row) for row in cursor]
 
-            return [
-                SSEEvent(
-                    run_id=row["run_id"],
-                    seq=row["seq"],
-                    type=EventType(row["type"]),
-                    step=WorkflowStep(row["step"]),
-                    agent=row["agent"],
-                    ts=row["ts"],
-                    elapsed_ms=row["elapsed_ms"],
-                    payload=json.loads(row["payload"]),
-                )
-                for row in rows
-            ]
+    def iter_events(self, run_id: str) -> Iterator[SSEEvent]:
+        """Yield a run's events in sequence order as SQLite produces them.
+
+        The generator may be resumed from different threads (e.g. by a
+        streaming response), so it reads on its own connection instead of
+        the calling thread's; WAL lets it run alongside the writers.
+
+        Args:
+            run_id: Run identifier
+
+        Yields:
+            Events ordered by sequence
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                "SELECT * FROM events WHERE run_id = ? ORDER BY seq",
+                (run_id,),
+            )
+            for row in cursor:
+                yield _event_from_row(row)
+        finally:
+            conn.close()
 
     def get_next_seq(self, run_id: str) -> int:
         """Get next sequence number for a run.
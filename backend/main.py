@@ -4,22 +4,31 @@ Main entry point for the backend API.
 """
 
 import os
+import re
 import asyncio
+import functools
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
+import orjson
 import structlog
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sse_starlette.sse import EventSourceResponse
+from fastapi.responses import JSONResponse, Response
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 from pydantic import BaseModel
 
 from schemas import WorkflowEvent, EventKind, RunStatus
 from schemas.runs import RunMetadata
 from services.event_bus import get_event_bus, close_event_bus
-from services.artifact_store import get_artifact_store
-from services.run_store import get_run_store
+from services.artifact_store import get_artifact_store, close_artifact_store
+from services.run_store import get_run_store, close_run_store
+
+
+def _orjson_dumps(obj, default=None, **_kwargs) -> str:
+    """JSONRenderer serializer backed by orjson (stdlib loggers expect str)."""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # Configure structured logging
 structlog.configure(
@@ -30,7 +39,7 @@ structlog.configure(
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
     ],
     wrapper_class=structlog.stdlib.BoundLogger,
     context_class=dict,
@@ -41,19 +50,102 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
+KEEPALIVE_INTERVAL_SECONDS = 25
+KEEPALIVE_MAX_INTERVAL_SECONDS = 600
+# Upper bound for connecting a service at startup or answering a keepalive ping
+SERVICE_TIMEOUT_SECONDS = 10
+
+
+async def _ping_services():
+    """Round-trip Redis and Postgres once."""
+    event_bus = await get_event_bus()
+    await event_bus.redis.ping()
+    run_store = await get_run_store()
+    async with run_store.pool.acquire() as conn:
+        await conn.fetchval("SELECT 1")
+
+
+async def _keepalive_loop():
+    """
+    Ping Redis and Postgres periodically so idle connections stay warm.
+
+    While the services are unreachable the interval doubles up to
+    KEEPALIVE_MAX_INTERVAL_SECONDS, and only the first failure is logged
+    as a warning.
+    """
+    interval = KEEPALIVE_INTERVAL_SECONDS
+    failures = 0
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.wait_for(_ping_services(), SERVICE_TIMEOUT_SECONDS)
+        except Exception as e:
+            failures += 1
+            interval = min(interval * 2, KEEPALIVE_MAX_INTERVAL_SECONDS)
+            log = logger.warning if failures == 1 else logger.debug
+            log("keepalive_failed", error=str(e) or type(e).__name__, failures=failures, retry_in=interval)
+        else:
+            if failures:
+                logger.info("keepalive_recovered", failures=failures)
+            failures = 0
+            interval = KEEPALIVE_INTERVAL_SECONDS
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - initialize and cleanup resources."""
     logger.info("starting_ic_autopilot_api")
 
-    # Initialize services (lazy - will connect on first use)
-    # Pre-warm connections can be added here if needed
+    # Pre-warm services so the first request doesn't pay connection setup.
+    # Each is bounded by SERVICE_TIMEOUT_SECONDS so a hanging host can't
+    # block startup; failures are logged, not raised: /ready reports them
+    # and the getters retry on next use.
+    services = {
+        "event_bus": get_event_bus,
+        "run_store": get_run_store,
+        "artifact_store": get_artifact_store,
+    }
+    results = await asyncio.gather(
+        *(asyncio.wait_for(getter(), SERVICE_TIMEOUT_SECONDS) for getter in services.values()),
+        return_exceptions=True,
+    )
+    for service, result in zip(services, results):
+        if isinstance(result, Exception):
+            logger.warning("service_prewarm_failed", service=service, error=str(result) or type(result).__name__)
+
+    app.state.keepalive_task = asyncio.create_task(_keepalive_loop())
 
     yield
 
     # Cleanup
     logger.info("shutting_down_ic_autopilot_api")
-    await close_event_bus()
+    app.state.keepalive_task.cancel()
+    try:
+        await app.state.keepalive_task
+    except asyncio.CancelledError:
+        pass
+
+    # Stop in-flight workflows before the services they publish to go away
+    runs = list(app.state.active_runs.values())
+    if runs:
+        logger.info("cancelling_active_runs", count=len(runs))
+        for task in runs:
+            task.cancel()
+        await asyncio.wait(runs, timeout=SERVICE_TIMEOUT_SECONDS)
+
+    # Release every pre-warmed service, each bounded like the prewarm
+    closers = {
+        "event_bus": close_event_bus,
+        "run_store": close_run_store,
+        "artifact_store": close_artifact_store,
+    }
+    results = await asyncio.gather(
+        *(asyncio.wait_for(closer(), SERVICE_TIMEOUT_SECONDS) for closer in closers.values()),
+        return_exceptions=True,
+    )
+    for service, result in zip(closers, results):
+        if isinstance(result, Exception):
+            logger.warning("service_close_failed", service=service, error=str(result) or type(result).__name__)
 
 
 # Create FastAPI app
@@ -63,6 +155,8 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
+# Workflow tasks started by the run endpoints, keyed by run_id
+app.state.active_runs = {}
 
 # CORS configuration
 app.add_middleware(
@@ -154,8 +248,33 @@ async def readiness_check():
 # IC Run Endpoints
 # ============================================================================
 
+def _start_run_task(run_id: str, coro) -> asyncio.Task:
+    """
+    Launch a workflow as its own task, detached from the request.
+
+    The task is tracked in app.state.active_runs until it finishes, which
+    also keeps a strong reference so it isn't garbage collected mid-run.
+    """
+    task = asyncio.create_task(coro, name=f"wf-{run_id}")
+    app.state.active_runs[run_id] = task
+    task.add_done_callback(functools.partial(_on_run_task_done, run_id))
+    return task
+
+
+def _on_run_task_done(run_id: str, task: asyncio.Task) -> None:
+    """Untrack a finished workflow task and surface any exception it raised."""
+    if app.state.active_runs.get(run_id) is task:
+        del app.state.active_runs[run_id]
+    if task.cancelled():
+        logger.info("workflow_task_cancelled", run_id=run_id)
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("workflow_task_failed", run_id=run_id, error=str(exc), exc_info=exc)
+
+
 @app.post("/api/ic/run", response_model=StartRunResponse)
-async def start_run(request: StartRunRequest, background_tasks: BackgroundTasks):
+async def start_run(request: StartRunRequest):
     """
     Start a new Investment Committee run.
 
@@ -173,7 +292,7 @@ async def start_run(request: StartRunRequest, background_tasks: BackgroundTasks)
         )
 
         # Start workflow in background
-        background_tasks.add_task(execute_workflow, run.run_id)
+        _start_run_task(run.run_id, execute_workflow(run.run_id))
 
         logger.info("run_started", run_id=run.run_id, mandate_id=request.mandate_id)
 
@@ -216,6 +335,7 @@ async def stream_events(request: Request, run_id: str, since: Optional[str] = No
     async def event_generator():
         """Generate SSE events from Redis stream."""
         event_bus = await get_event_bus()
+        retry = 5000  # Retry in 5 seconds on disconnect; sent once, the browser keeps it
 
         try:
             async for event in event_bus.subscribe(run_id, last_event_id):
@@ -224,19 +344,20 @@ async def stream_events(request: Request, run_id: str, since: Optional[str] = No
                     logger.info("sse_client_disconnected", run_id=run_id)
                     break
 
-                yield {
-                    "id": event.event_id,
-                    "event": event.kind.value,
-                    "data": event.to_sse_data(),
-                    "retry": 5000,  # Retry in 5 seconds on disconnect
-                }
+                yield ServerSentEvent(
+                    data=event.to_sse_data(),
+                    event=event.kind.value,
+                    id=event.event_id,
+                    retry=retry,
+                )
+                retry = None
 
         except asyncio.CancelledError:
             logger.info("sse_stream_cancelled", run_id=run_id)
         except Exception as e:
             logger.error("sse_stream_error", run_id=run_id, error=str(e))
 
-    return EventSourceResponse(event_generator())
+    return EventSourceResponse(event_generator(), ping=15)
 
 
 @app.get("/api/ic/runs/{run_id}/artifacts")
@@ -308,7 +429,6 @@ async def list_runs(
 @app.post("/api/ic/policy", response_model=OrchestratorRunResponse)
 async def start_orchestrator_run(
     policy: dict,
-    background_tasks: BackgroundTasks,
     workflow_type: Optional[str] = "handoff",
 ):
     """
@@ -357,12 +477,7 @@ async def start_orchestrator_run(
         )
 
         # Start orchestrator in background with selected workflow type
-        background_tasks.add_task(
-            execute_orchestrator_workflow,
-            run_id,
-            ips,
-            workflow_type,
-        )
+        _start_run_task(run_id, execute_orchestrator_workflow(run_id, ips, workflow_type))
 
         logger.info(
             "orchestrator_run_started",
@@ -384,6 +499,57 @@ async def start_orchestrator_run(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Static catalogue, serialized once at import
+_WORKFLOW_TYPES_JSON = orjson.dumps({
+    "workflow_types": [
+        {
+            "id": "sequential",
+            "name": "Sequential",
+            "description": "Linear agent execution: Market → Risk → Return → Optimizer → Compliance",
+            "use_case": "Simple, predictable workflows where each step depends on the previous",
+            "agents_flow": ["market_agent", "risk_agent", "return_agent", "optimizer_agent", "compliance_agent"],
+        },
+        {
+            "id": "concurrent",
+            "name": "Concurrent (Fan-out/Fan-in)",
+            "description": "Parallel risk and return analysis with aggregation",
+            "use_case": "When risk and return analysis can run independently",
+            "agents_flow": ["[risk_agent, return_agent] → aggregator"],
+        },
+        {
+            "id": "handoff",
+            "name": "Handoff (Recommended)",
+            "description": "Coordinator delegates to specialist agents based on needs",
+            "use_case": "Dynamic routing where a coordinator decides which specialist to invoke",
+            "agents_flow": ["coordinator → [risk_agent | return_agent | optimizer_agent | compliance_agent]"],
+            "is_default": True,
+        },
+        {
+            "id": "magentic",
+            "name": "Magentic-One",
+            "description": "LLM-powered dynamic planning and execution with adaptive replanning",
+            "use_case": "Complex tasks requiring dynamic planning and multi-round orchestration",
+            "agents_flow": ["manager → dynamic agent selection based on plan"],
+        },
+        {
+            "id": "dag",
+            "name": "DAG (Directed Acyclic Graph)",
+            "description": "Custom execution graph with fan-out from market to risk/return, then fan-in",
+            "use_case": "Complex workflows with explicit parallel and sequential sections",
+            "agents_flow": ["policy_parser → market → [risk, return] → aggregator → optimizer → compliance → finalizer"],
+        },
+        {
+            "id": "group_chat",
+            "name": "Group Chat (Consensus)",
+            "description": "Multi-agent round-robin discussion for consensus building",
+            "use_case": "When multiple perspectives needed for complex decisions requiring debate and consensus",
+            "agents_flow": ["[risk_advisor, return_advisor, portfolio_architect, compliance_reviewer] → round-robin discussion → consensus"],
+        },
+    ],
+    "default": "handoff",
+})
+
+
 @app.get("/api/ic/workflows")
 async def get_workflow_types():
     """
@@ -391,87 +557,67 @@ async def get_workflow_types():
 
     Returns information about each workflow pattern supported by the orchestrator.
     """
-    return {
-        "workflow_types": [
-            {
-                "id": "sequential",
-                "name": "Sequential",
-                "description": "Linear agent execution: Market → Risk → Return → Optimizer → Compliance",
-                "use_case": "Simple, predictable workflows where each step depends on the previous",
-                "agents_flow": ["market_agent", "risk_agent", "return_agent", "optimizer_agent", "compliance_agent"],
-            },
-            {
-                "id": "concurrent",
-                "name": "Concurrent (Fan-out/Fan-in)",
-                "description": "Parallel risk and return analysis with aggregation",
-                "use_case": "When risk and return analysis can run independently",
-                "agents_flow": ["[risk_agent, return_agent] → aggregator"],
-            },
-            {
-                "id": "handoff",
-                "name": "Handoff (Recommended)",
-                "description": "Coordinator delegates to specialist agents based on needs",
-                "use_case": "Dynamic routing where a coordinator decides which specialist to invoke",
-                "agents_flow": ["coordinator → [risk_agent | return_agent | optimizer_agent | compliance_agent]"],
-                "is_default": True,
-            },
-            {
-                "id": "magentic",
-                "name": "Magentic-One",
-                "description": "LLM-powered dynamic planning and execution with adaptive replanning",
-                "use_case": "Complex tasks requiring dynamic planning and multi-round orchestration",
-                "agents_flow": ["manager → dynamic agent selection based on plan"],
-            },
-            {
-                "id": "dag",
-                "name": "DAG (Directed Acyclic Graph)",
-                "description": "Custom execution graph with fan-out from market to risk/return, then fan-in",
-                "use_case": "Complex workflows with explicit parallel and sequential sections",
-                "agents_flow": ["policy_parser → market → [risk, return] → aggregator → optimizer → compliance → finalizer"],
-            },
-            {
-                "id": "group_chat",
-                "name": "Group Chat (Consensus)",
-                "description": "Multi-agent round-robin discussion for consensus building",
-                "use_case": "When multiple perspectives needed for complex decisions requiring debate and consensus",
-                "agents_flow": ["[risk_advisor, return_advisor, portfolio_architect, compliance_reviewer] → round-robin discussion → consensus"],
-            },
-        ],
-        "default": "handoff",
-    }
+    return Response(content=_WORKFLOW_TYPES_JSON, media_type="application/json")
 
 
-@app.get("/api/ic/policy/templates")
-async def get_policy_templates():
-    """Get predefined IPS templates for quick start."""
+@functools.lru_cache(maxsize=1)
+def _policy_templates() -> tuple:
+    """Build the IPS templates once; only their identity fields vary per request."""
     from schemas.policy import (
         create_conservative_ips,
         create_balanced_ips,
         create_aggressive_ips,
     )
 
-    return {
-        "templates": [
-            {
-                "id": "conservative",
-                "name": "Conservative",
-                "description": "Low risk, capital preservation focus",
-                "policy": create_conservative_ips().model_dump(),
-            },
-            {
-                "id": "balanced",
-                "name": "Balanced",
-                "description": "Moderate risk, balanced growth",
-                "policy": create_balanced_ips().model_dump(),
-            },
-            {
-                "id": "aggressive",
-                "name": "Aggressive Growth",
-                "description": "Higher risk, growth focus",
-                "policy": create_aggressive_ips().model_dump(),
-            },
-        ]
-    }
+    return (
+        {
+            "id": "conservative",
+            "name": "Conservative",
+            "description": "Low risk, capital preservation focus",
+            "policy": create_conservative_ips().model_dump(mode="json"),
+        },
+        {
+            "id": "balanced",
+            "name": "Balanced",
+            "description": "Moderate risk, balanced growth",
+            "policy": create_balanced_ips().model_dump(mode="json"),
+        },
+        {
+            "id": "aggressive",
+            "name": "Aggressive Growth",
+            "description": "Higher risk, growth focus",
+            "policy": create_aggressive_ips().model_dump(mode="json"),
+        },
+    )
+
+
+@app.get("/api/ic/policy/templates")
+async def get_policy_templates():
+    """Get predefined IPS templates for quick start."""
+    from schemas.policy import InvestorPolicyStatement
+
+    # Each template hands out a fresh policy, as if built for this request
+    fields = InvestorPolicyStatement.model_fields
+    templates = []
+    for template in _policy_templates():
+        policy = dict(template["policy"])
+        policy["policy_id"] = fields["policy_id"].get_default(call_default_factory=True)
+        policy["created_at"] = fields["created_at"].get_default(call_default_factory=True)
+        templates.append({**template, "policy": policy})
+
+    return Response(
+        content=orjson.dumps({"templates": templates}),
+        media_type="application/json",
+    )
+
+
+# Chat keyword matchers: one alternation per group keeps the original
+# substring semantics with a single scan of the message.
+_CONSERVATIVE_RE = re.compile(r"conservative|safe|low risk|preserve")
+_AGGRESSIVE_RE = re.compile(r"aggressive|growth|high return")
+_VALUE_RE = re.compile(r'\$?([\d,]+(?:\.\d+)?)\s*(?:million|m|k)?')
+_TOBACCO_RE = re.compile(r"no tobacco|exclude tobacco|tobacco free")
+_ESG_RE = re.compile(r"esg|sustainable|green|responsible")
 
 
 @app.post("/api/ic/chat")
@@ -482,10 +628,17 @@ async def chat_with_advisor(message: dict):
     Takes a user message and returns an updated policy suggestion.
     This powers the chat panel in the onboarding flow.
     """
-    from schemas.policy import InvestorPolicyStatement, create_balanced_ips
+    # Policy validation and dumping is CPU work; keep it off the event loop
+    return await asyncio.to_thread(
+        _apply_chat_updates,
+        message.get("message", ""),
+        message.get("current_policy"),
+    )
+
 
-    user_message = message.get("message", "")
-    current_policy = message.get("current_policy")
+def _apply_chat_updates(user_message: str, current_policy: Optional[dict]) -> dict:
+    """Apply keyword-driven updates from a chat message to the current policy."""
+    from schemas.policy import InvestorPolicyStatement, create_balanced_ips
 
     # Start with current policy or default
     if current_policy:
@@ -500,7 +653,7 @@ async def chat_with_advisor(message: dict):
     user_lower = user_message.lower()
 
     # Risk tolerance keywords
-    if any(word in user_lower for word in ["conservative", "safe", "low risk", "preserve"]):
+    if _CONSERVATIVE_RE.search(user_lower):
         ips.risk_appetite.risk_tolerance = "conservative"
         ips.risk_appetite.max_volatility = 8.0
         ips.risk_appetite.max_drawdown = 10.0
@@ -508,7 +661,7 @@ async def chat_with_advisor(message: dict):
         updates.append("Set conservative risk profile")
         response_text = "I've set your profile to conservative with lower equity exposure and tighter risk limits."
 
-    elif any(word in user_lower for word in ["aggressive", "growth", "high return"]):
+    elif _AGGRESSIVE_RE.search(user_lower):
         ips.risk_appetite.risk_tolerance = "aggressive"
         ips.risk_appetite.max_volatility = 20.0
         ips.risk_appetite.max_drawdown = 25.0
@@ -517,21 +670,21 @@ async def chat_with_advisor(message: dict):
         response_text = "I've set your profile to aggressive growth with higher equity allocation."
 
     # Portfolio value keywords
-    import re
-    value_match = re.search(r'\$?([\d,]+(?:\.\d+)?)\s*(?:million|m|k)?', user_lower)
+    value_match = _VALUE_RE.search(user_lower)
     if value_match:
         value_str = value_match.group(1).replace(',', '')
         value = float(value_str)
-        if 'million' in user_lower or 'm' in user_lower.split():
+        words = user_lower.split()
+        if 'million' in user_lower or 'm' in words:
             value *= 1_000_000
-        elif 'k' in user_lower.split():
+        elif 'k' in words:
             value *= 1_000
         if value >= 10000:
             ips.investor_profile.portfolio_value = value
             updates.append(f"Set portfolio value to ${value:,.0f}")
 
     # Exclusion keywords
-    if any(word in user_lower for word in ["no tobacco", "exclude tobacco", "tobacco free"]):
+    if _TOBACCO_RE.search(user_lower):
         from schemas.policy import ExclusionRule
         ips.preferences.exclusions.append(
             ExclusionRule(type="sector", value="Tobacco", reason="User preference")
@@ -539,7 +692,7 @@ async def chat_with_advisor(message: dict):
         updates.append("Added tobacco exclusion")
         response_text = "I've added tobacco to your exclusion list."
 
-    if any(word in user_lower for word in ["esg", "sustainable", "green", "responsible"]):
+    if _ESG_RE.search(user_lower):
         ips.preferences.esg_focus = True
         ips.preferences.min_esg_score = 60
         updates.append("Enabled ESG screening")
@@ -6,7 +6,7 @@ Events are published to Redis Streams and consumed by the SSE endpoint.
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 import uuid
 
 
@@ -119,13 +119,25 @@ class WorkflowEvent(BaseModel):
     progress_pct: Optional[float] = Field(default=None, ge=0, le=100, description="Stage progress percentage")
     duration_ms: Optional[int] = Field(default=None, description="Duration in milliseconds")
 
+    # Wire JSON the event was parsed from, reused verbatim for SSE
+    _sse_data: Optional[str] = PrivateAttr(default=None)
+
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
 
+    @classmethod
+    def from_sse_data(cls, data: str) -> "WorkflowEvent":
+        """Parse an event from its stored JSON, keeping the JSON for re-streaming."""
+        event = cls.model_validate_json(data)
+        event._sse_data = data
+        return event
+
     def to_sse_data(self) -> str:
         """Format event for SSE transmission."""
+        if self._sse_data is not None:
+            return self._sse_data
         return self.model_dump_json()
 
 
@@ -251,6 +251,10 @@ class ArtifactStore:
 
         return bundle
 
+    async def close(self):
+        """Close the blob container client."""
+        await self.container.close()
+
 
 # In-memory fallback store for when blob storage is unavailable
 class InMemoryArtifactStore:
@@ -295,6 +299,9 @@ class InMemoryArtifactStore:
         """Get audit bundle."""
         return {"run_id": run_id, "artifacts": await self.list_artifacts(run_id)}
 
+    async def close(self):
+        """Nothing to release for the in-memory store."""
+
 
 # Singleton instance
 _artifact_store: Optional[ArtifactStore] = None
@@ -310,3 +317,11 @@ async def get_artifact_store() -> ArtifactStore:
             logger.warning("blob_storage_unavailable", error=str(e), fallback="in_memory")
             _artifact_store = InMemoryArtifactStore()
     return _artifact_store
+
+
+async def close_artifact_store():
+    """Close the singleton ArtifactStore instance."""
+    global _artifact_store
+    if _artifact_store is not None:
+        await _artifact_store.close()
+        _artifact_store = None
@@ -170,7 +170,7 @@ class EventBus:
                             # Parse event
                             try:
                                 event_json = message_data.get("data", "{}")
-                                event = WorkflowEvent.model_validate_json(event_json)
+                                event = WorkflowEvent.from_sse_data(event_json)
                                 yield event
 
                                 # Check for run completion
@@ -223,7 +223,7 @@ class EventBus:
         for message_id, message_data in messages:
             try:
                 event_json = message_data.get("data", "{}")
-                event = WorkflowEvent.model_validate_json(event_json)
+                event = WorkflowEvent.from_sse_data(event_json)
                 events.append(event)
             except Exception as e:
                 logger.error("event_parse_error", error=str(e))
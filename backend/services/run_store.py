@@ -368,3 +368,11 @@ async def get_run_store() -> RunStore:
     if _run_store is None:
         _run_store = await RunStore.create()
     return _run_store
+
+
+async def close_run_store():
+    """Close the singleton RunStore instance."""
+    global _run_store
+    if _run_store is not None:
+        await _run_store.close()
+        _run_store = None
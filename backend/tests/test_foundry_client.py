@@ -0,0 +1,112 @@
+"""
+Tests for FoundryAgentClient response parsing.
+"""
+
+import os
+
+import pytest
+
+# Set dry-run mode for tests
+os.environ["DRY_RUN_MODE"] = "true"
+os.environ["LOG_FORMAT"] = "text"
+os.environ["DATABASE_URL"] = "sqlite:///./test_runbook.db"
+
+from app.foundry_client import FoundryAgentClient
+
+
+@pytest.fixture
+def client():
+    """Fresh client (dry-run, no Azure connection)."""
+    return FoundryAgentClient()
+
+
+# =============================================================================
+# JSON Extraction Tests
+# =============================================================================
+
+class TestExtractJson:
+    """Tests for _extract_json on agent output."""
+
+    def test_plain_json(self, client):
+        """Test a response that is a single JSON object."""
+        assert client._extract_json('{"decision": "CLEAR"}') == {"decision": "CLEAR"}
+
+    def test_code_block(self, client):
+        """Test JSON wrapped in a markdown code block."""
+        text = 'Result:\n```json\n{"decision": "BLOCK"}\n```\nDone.'
+        assert client._extract_json(text) == {"decision": "BLOCK"}
+
+    def test_prose_around_object(self, client):
+        """Test a top-level object embedded in prose with braces in strings."""
+        text = 'Here you go: {"agent": "liquidity", "note": "uses {braces}"} thanks'
+        assert client._extract_json(text) == {"agent": "liquidity", "note": "uses {braces}"}
+
+    def test_truncated_output_raises(self, client):
+        """Test truncated output does not fall back to a nested object."""
+        text = '{"agent": "liquidity", "breach_assessment": {}, "recommendation": {"action": "PRO'
+        with pytest.raises(ValueError):
+            client._extract_json(text)
+
+    def test_malformed_output_raises(self, client):
+        """Test a malformed top-level object does not yield its inner objects."""
+        text = '{"agent": "liquidity", "breach_assessment": {} "recommendation": {"action": "PROCEED"}}'
+        with pytest.raises(ValueError):
+            client._extract_json(text)
+
+    def test_malformed_then_valid_object(self, client):
+        """Test a valid top-level object after a malformed one is still found."""
+        text = '{"broken": {"inner": 1} oops} then {"decision": "CLEAR"}'
+        assert client._extract_json(text) == {"decision": "CLEAR"}
+
+    def test_top_level_array_falls_through_to_object_search(self, client):
+        """Test a response that parses as a non-object still yields the embedded object."""
+        assert client._extract_json('[{"decision": "CLEAR"}]') == {"decision": "CLEAR"}
+
+    def test_scalar_output_raises(self, client):
+        """Test a bare JSON scalar is not returned as the result."""
+        with pytest.raises(ValueError):
+            client._extract_json('"CLEAR"')
+
+
+class TestParseLiquidityResponse:
+    """Tests for liquidity parsing fallbacks."""
+
+    def test_malformed_response_assumes_breach(self, client):
+        """Test malformed agent output takes the breach fallback, not an inner dict."""
+        text = '{"breach_assessment": {}, "recommendation": {"action": "PROCEED"} "pass_to_next_agent": true'
+        result = client._parse_liquidity_response(text, {"amount": 1}, "tool-1")
+
+        assert result.breach_assessment["breach"] == True
+
+
+# =============================================================================
+# Error-Path Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestErrorTemplates:
+    """Tests for the error-path result templates."""
+
+    async def test_procedures_error_results_do_not_share_state(self, client, monkeypatch):
+        """Test mutating one error result does not leak into the next."""
+        from app import foundry_client
+        from app.logging_config import RunbookLogger
+
+        async def failing_agent(**kwargs):
+            raise RuntimeError("agent unavailable")
+
+        monkeypatch.setattr(foundry_client, "is_dry_run", lambda: False)
+        client._run_agent_with_retry = failing_agent
+        sanctions = client._stub_sanctions_response("ACME Trading LLC")
+        liquidity = client._stub_liquidity_response(100000, "USD", "BankSubsidiary_TR")
+
+        first = await client.run_operational_procedures({}, sanctions, liquidity, RunbookLogger("run-a"))
+        first.required_approvals.clear()
+        first.workflow_steps.append("tampered")
+        first.workflow_determination["final_action"] = "PROCEED"
+
+        second = await client.run_operational_procedures({}, sanctions, liquidity, RunbookLogger("run-b"))
+
+        assert second.workflow_determination["final_action"] == "HOLD"
+        assert len(second.required_approvals) > 0
+        assert "tampered" not in second.workflow_steps
@@ -0,0 +1,35 @@
+"""
+Tests for logging setup.
+"""
+
+import os
+
+import pytest
+
+# Set dry-run mode for tests
+os.environ["DRY_RUN_MODE"] = "true"
+os.environ["LOG_FORMAT"] = "text"
+os.environ["DATABASE_URL"] = "sqlite:///./test_runbook.db"
+
+from app import logging_config
+
+
+class TestSetupLogging:
+    """Tests for setup_logging."""
+
+    def test_failed_setup_is_retried(self, monkeypatch):
+        """Test a setup attempt that raises leaves logging unconfigured."""
+        monkeypatch.setattr(logging_config, "_LOGGING_CONFIGURED", False)
+        get_settings = logging_config.get_settings
+
+        def broken_settings():
+            raise RuntimeError("settings unavailable")
+
+        monkeypatch.setattr(logging_config, "get_settings", broken_settings)
+        with pytest.raises(RuntimeError):
+            logging_config.setup_logging()
+        assert logging_config._LOGGING_CONFIGURED == False
+
+        monkeypatch.setattr(logging_config, "get_settings", get_settings)
+        logging_config.setup_logging()
+        assert logging_config._LOGGING_CONFIGURED == True
@@ -0,0 +1,110 @@
+"""
+Tests for WorkflowOrchestrator run lifecycle.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+# Set dry-run mode for tests
+os.environ["DRY_RUN_MODE"] = "true"
+os.environ["LOG_FORMAT"] = "text"
+os.environ["DATABASE_URL"] = "sqlite:///./test_runbook.db"
+
+from app.foundry_client import FoundryAgentClient
+from app.orchestrator import WorkflowOrchestrator
+from app.schemas import EventType, FinalDecision, RunbookStartRequest
+from app.sse import SSEManager
+from app.storage import RunbookStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Storage backed by a throwaway database."""
+    return RunbookStorage(f"sqlite:///{tmp_path / 'runbook.db'}")
+
+
+@pytest.fixture
+def orchestrator(storage):
+    """Orchestrator wired to a dry-run client and private SSE manager."""
+    return WorkflowOrchestrator(
+        foundry_client=FoundryAgentClient(),
+        sse_manager=SSEManager(storage=storage),
+        storage=storage,
+    )
+
+
+@pytest.mark.asyncio
+class TestLiquidityTask:
+    """Tests for the concurrent liquidity screening task."""
+
+    async def test_block_waits_for_cancelled_liquidity_task(self, orchestrator):
+        """Test a sanctions BLOCK cancels liquidity and waits for it to wind down."""
+        state = {"cancelled": False, "finished": False}
+
+        async def slow_liquidity(**kwargs):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                await asyncio.sleep(0.05)  # Cleanup that outlives the cancel
+                raise
+            finally:
+                state["finished"] = True
+
+        orchestrator.foundry_client.run_liquidity_screening = slow_liquidity
+        run_id = await orchestrator.start_workflow(
+            RunbookStartRequest(message="Process payment of $100,000 USD to BANK MASKAN")
+        )
+
+        packet = await orchestrator.execute_workflow(run_id)
+
+        assert packet.decision == FinalDecision.REJECT
+        assert state == {"cancelled": True, "finished": True}
+
+    async def test_cancelled_workflow_cancels_liquidity_task(self, orchestrator):
+        """Test cancelling the workflow itself does not orphan the liquidity task."""
+        state = {"started": asyncio.Event(), "finished": False}
+
+        async def slow_liquidity(**kwargs):
+            state["started"].set()
+            try:
+                await asyncio.sleep(60)
+            finally:
+                state["finished"] = True
+
+        orchestrator.foundry_client.run_liquidity_screening = slow_liquidity
+        run_id = await orchestrator.start_workflow(
+            RunbookStartRequest(message="Process payment of $100,000 USD to ACME Trading LLC")
+        )
+
+        workflow = asyncio.create_task(orchestrator.execute_workflow(run_id))
+        await state["started"].wait()
+        workflow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await workflow
+
+        assert state["finished"] == True
+
+
+@pytest.mark.asyncio
+class TestFinalize:
+    """Tests for workflow finalization."""
+
+    async def test_failed_decision_save_emits_no_final_event(self, orchestrator, storage):
+        """Test a run whose decision cannot be saved ends with ERROR only, never FINAL."""
+        def failing_save(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        storage.save_decision = failing_save
+        run_id = await orchestrator.start_workflow(
+            RunbookStartRequest(message="Process payment of $100,000 USD to BANK MASKAN")
+        )
+
+        with pytest.raises(RuntimeError):
+            await orchestrator.execute_workflow(run_id)
+
+        types = [event.type for event in storage.get_events(run_id)]
+        assert EventType.FINAL not in types
+        assert types[-1] == EventType.ERROR
@@ -242,7 +242,10 @@ class TestDirectAgentEndpoints:
 def cleanup():
     """Clean up test database after tests."""
     yield
-    # Remove test database
+    # Release connections, then remove test database and WAL sidecars
+    from app.storage import get_storage
+    get_storage().close()
     import os
-    if os.path.exists("test_runbook.db"):
-        os.remove("test_runbook.db")
+    for path in ("test_runbook.db", "test_runbook.db-wal", "test_runbook.db-shm"):
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,176 @@
+"""
+Tests for SSEManager fan-out.
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+import pytest
+
+# Set dry-run mode for tests
+os.environ["DRY_RUN_MODE"] = "true"
+os.environ["LOG_FORMAT"] = "text"
+os.environ["DATABASE_URL"] = "sqlite:///./test_runbook.db"
+
+from app import sse
+from app.schemas import WorkflowStep
+from app.sse import SSEManager
+from app.storage import RunbookStorage
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """SSE manager persisting to a throwaway database."""
+    return SSEManager(storage=RunbookStorage(f"sqlite:///{tmp_path / 'runbook.db'}"))
+
+
+async def _subscribe(manager: SSEManager, run_id: str):
+    """Open a subscription and wait until it is registered."""
+    stream = manager.subscribe(run_id)
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    return stream, first
+
+
+async def _emit(manager: SSEManager, run_id: str, n: int):
+    """Emit an agent message numbered n."""
+    return await manager.agent_message(run_id, WorkflowStep.INTAKE, "Test", f"msg-{n}")
+
+
+# =============================================================================
+# Slow Subscriber Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestSlowSubscriber:
+    """Tests for dropping subscribers that fall too far behind."""
+
+    async def test_stalled_subscriber_is_closed(self, manager, monkeypatch, caplog):
+        """Test a stalled subscriber is closed while others keep receiving."""
+        monkeypatch.setattr(sse, "SUBSCRIBER_QUEUE_SIZE", 4)
+        await manager.start_run("run-1")
+        fast, fast_first = await _subscribe(manager, "run-1")
+        stalled, stalled_first = await _subscribe(manager, "run-1")
+
+        received = []
+
+        async def consume():
+            received.append(await fast_first)
+            async for frame in fast:
+                received.append(frame)
+
+        consumer = asyncio.create_task(consume())
+
+        with caplog.at_level(logging.WARNING, logger="sse"):
+            # One frame reaches the stalled subscriber's pending read, then
+            # its queue fills and the next frame drops it
+            for n in range(6):
+                await _emit(manager, "run-1", n)
+                while len(received) <= n:
+                    await asyncio.sleep(0)
+
+        await stalled_first
+        backlog = [frame async for frame in stalled]
+        assert backlog == []
+        assert len(manager._queues["run-1"]) == 1
+        assert any("run-1" in r.getMessage() for r in caplog.records if r.levelno == logging.WARNING)
+
+        await _emit(manager, "run-1", 6)
+        await manager.end_run("run-1")
+        await consumer
+
+        assert [b"msg-%d" % n in frame for n, frame in enumerate(received)] == [True] * 7
+
+
+# =============================================================================
+# Batch Tests
+# =============================================================================
+
+def _seqs(frames: list[bytes]) -> list[int]:
+    """Extract sequence numbers from SSE frames, in delivery order."""
+    return [
+        json.loads(line[len(b"data: "):])["seq"]
+        for frame in frames
+        for line in frame.split(b"\n")
+        if line.startswith(b"data: ")
+    ]
+
+
+async def _drain(stream, first) -> list[bytes]:
+    """Collect frames until the run's end signal."""
+    return [await first] + [frame async for frame in stream]
+
+
+@pytest.mark.asyncio
+class TestBatch:
+    """Tests for SSEManager.batch()."""
+
+    async def test_frames_flushed_in_order_on_exit(self, manager):
+        """Test frames buffered in a batch are delivered together, in seq order."""
+        await manager.start_run("run-1")
+        stream, first = await _subscribe(manager, "run-1")
+
+        async with manager.batch("run-1"):
+            for n in range(3):
+                await _emit(manager, "run-1", n)
+            await asyncio.sleep(0)
+            assert not first.done()
+
+        await _emit(manager, "run-1", 3)
+        await manager.end_run("run-1")
+        frames = await _drain(stream, first)
+
+        assert len(frames) == 2
+        assert _seqs(frames) == [1, 2, 3, 4]
+
+    async def test_frames_flushed_when_block_raises(self, manager):
+        """Test buffered frames still go out if the batch block raises."""
+        await manager.start_run("run-1")
+        stream, first = await _subscribe(manager, "run-1")
+
+        with pytest.raises(RuntimeError):
+            async with manager.batch("run-1"):
+                await _emit(manager, "run-1", 0)
+                await _emit(manager, "run-1", 1)
+                raise RuntimeError("boom")
+
+        await manager.end_run("run-1")
+
+        assert _seqs(await _drain(stream, first)) == [1, 2]
+
+    async def test_end_run_inside_batch_flushes_before_end_signal(self, manager):
+        """Test end_run mid-batch delivers buffered frames before closing streams."""
+        await manager.start_run("run-1")
+        stream, first = await _subscribe(manager, "run-1")
+
+        async with manager.batch("run-1"):
+            await _emit(manager, "run-1", 0)
+            await _emit(manager, "run-1", 1)
+            await manager.end_run("run-1")
+
+        assert _seqs(await _drain(stream, first)) == [1, 2]
+        assert "run-1" not in manager._queues
+
+
+# =============================================================================
+# Frame Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestFrame:
+    """Tests for SSEEvent.to_sse framing."""
+
+    async def test_frame_body_matches_model_dump(self, manager):
+        """Test the frame body is the event's full JSON serialization."""
+        await manager.start_run("run-1")
+        event = await manager.agent_message(
+            "run-1", WorkflowStep.INTAKE, "Test", "héllo", data={"nested": [1, {"a": None}]}
+        )
+
+        frame = event.to_sse()
+
+        assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+        assert json.loads(frame[len(b"data: "):]) == event.model_dump(mode="json")
+        assert json.loads(event.payload_json()) == event.payload
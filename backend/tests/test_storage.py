@@ -0,0 +1,233 @@
+"""
+Tests for RunbookStorage write-behind paths.
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+# Set dry-run mode for tests
+os.environ["DRY_RUN_MODE"] = "true"
+os.environ["LOG_FORMAT"] = "text"
+os.environ["DATABASE_URL"] = "sqlite:///./test_runbook.db"
+
+from app.schemas import EventType, RunStatus, SSEEvent, WorkflowStep
+from app.storage import RunbookStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Storage backed by a throwaway database."""
+    return RunbookStorage(f"sqlite:///{tmp_path / 'runbook.db'}")
+
+
+async def _start(coro) -> asyncio.Task:
+    """Start a writer task and let it install its queue."""
+    task = asyncio.create_task(coro)
+    await asyncio.sleep(0)
+    return task
+
+
+async def _stop(task: asyncio.Task) -> None:
+    """Cancel a writer task and wait for its shutdown flush."""
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+# =============================================================================
+# Connection Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestClose:
+    """Tests for RunbookStorage.close()."""
+
+    async def test_close_releases_all_thread_connections(self, storage, tmp_path):
+        """Test close() closes worker-thread connections and removes WAL files."""
+        storage.create_run("run-1", {})
+        await asyncio.to_thread(storage.update_run_status, "run-1", RunStatus.RUNNING)
+        assert (tmp_path / "runbook.db-wal").exists()
+
+        storage.close()
+
+        assert not (tmp_path / "runbook.db-wal").exists()
+        assert not (tmp_path / "runbook.db-shm").exists()
+        # Storage reopens connections on next use
+        assert storage.get_run("run-1").status == RunStatus.RUNNING
+
+
+# =============================================================================
+# Status Writer Tests
+# =============================================================================
+
+@pytest.mark.asyncio
+class TestRunStatusWriter:
+    """Tests for run_status_writer."""
+
+    async def test_shutdown_flushes_queued_updates(self, storage):
+        """Test updates still queued at cancellation are written."""
+        storage.create_run("run-1", {})
+        writer = await _start(storage.run_status_writer(batch_window=60))
+
+        storage.update_run_status_deferred("run-1", RunStatus.RUNNING)
+        await asyncio.sleep(0)
+        await _stop(writer)
+
+        assert storage.get_run("run-1").status == RunStatus.RUNNING
+
+    async def test_cancel_during_write_does_not_reapply_batch(self, storage):
+        """Test a batch already handed to the worker thread is not written again."""
+        storage.create_run("run-1", {})
+        applied = []
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        apply_updates = storage._apply_status_updates
+
+        def slow_apply(updates):
+            applied.append(list(updates))
+            if len(applied) == 1:
+                started.set()
+                release.wait(5)
+            apply_updates(updates)
+            finished.set()
+
+        storage._apply_status_updates = slow_apply
+        writer = await _start(storage.run_status_writer(batch_window=0))
+
+        storage.update_run_status_deferred("run-1", RunStatus.COMPLETED)
+        await asyncio.to_thread(started.wait, 5)
+        await _stop(writer)
+        release.set()
+        await asyncio.to_thread(finished.wait, 5)
+
+        assert len(applied) == 1
+        assert storage.get_run("run-1").status == RunStatus.COMPLETED
+
+
+# =============================================================================
+# Event Writer Tests
+# =============================================================================
+
+def _event(seq: int, run_id: str = "run-1") -> SSEEvent:
+    """Build a minimal SSE event."""
+    return SSEEvent(
+        run_id=run_id,
+        seq=seq,
+        type=EventType.AGENT_MESSAGE,
+        step=WorkflowStep.INTAKE,
+        agent="Test",
+        payload={"n": seq},
+    )
+
+
+@pytest.mark.asyncio
+class TestRunEventWriter:
+    """Tests for save_event_deferred and run_event_writer."""
+
+    async def test_batches_respect_max_batch_and_keep_seq_order(self, storage):
+        """Test transactions hold at most max_batch events and seq order survives."""
+        storage.create_run("run-1", {})
+        batch_sizes = []
+        save_events = storage.save_events
+
+        def record_batch(events):
+            batch_sizes.append(len(events))
+            save_events(events)
+
+        storage.save_events = record_batch
+        writer = await _start(storage.run_event_writer(max_batch=4))
+
+        for seq in range(1, 11):
+            storage.save_event_deferred(_event(seq))
+        while sum(batch_sizes) < 10:
+            await asyncio.sleep(0.01)
+        await _stop(writer)
+
+        assert max(batch_sizes) <= 4
+        assert [e.seq for e in storage.get_events("run-1")] == list(range(1, 11))
+        assert [e.payload["n"] for e in storage.get_events("run-1")] == list(range(1, 11))
+
+    async def test_full_queue_saves_inline(self, storage):
+        """Test events beyond max_pending are written inline, none are lost."""
+        storage.create_run("run-1", {})
+        inline = []
+        save_event = storage.save_event
+
+        def record_inline(event):
+            inline.append(event.seq)
+            save_event(event)
+
+        storage.save_event = record_inline
+        writer = await _start(storage.run_event_writer(max_pending=2))
+
+        # No await between puts: the writer cannot drain, so the queue fills
+        for seq in range(1, 6):
+            storage.save_event_deferred(_event(seq))
+        await _stop(writer)
+
+        assert inline == [3, 4, 5]
+        assert [e.seq for e in storage.get_events("run-1")] == [1, 2, 3, 4, 5]
+
+    async def test_without_writer_saves_inline(self, storage):
+        """Test deferred saves fall back to a synchronous insert outside the lifespan."""
+        storage.create_run("run-1", {})
+
+        storage.save_event_deferred(_event(1))
+
+        assert [e.seq for e in storage.get_events("run-1")] == [1]
+
+    async def test_lifespan_shutdown_flushes_events(self, storage, monkeypatch):
+        """Test events queued when the app shuts down are persisted."""
+        from app import main
+
+        monkeypatch.setattr(main, "get_storage", lambda: storage)
+        storage.create_run("run-1", {})
+
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+            for seq in range(1, 4):
+                storage.save_event_deferred(_event(seq))
+
+        assert storage._event_queue is None
+        assert [e.seq for e in storage.get_events("run-1")] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+class TestIterEvents:
+    """Tests for iter_events and the streamed run detail response."""
+
+    async def test_yields_events_in_seq_order(self, storage):
+        """Test events come back in seq order and the generator closes its connection."""
+        storage.create_run("run-1", {})
+        storage.save_events([_event(seq) for seq in (3, 1, 2)])
+
+        events = storage.iter_events("run-1")
+        assert next(events).seq == 1
+        events.close()
+
+        assert [e.seq for e in storage.iter_events("run-1")] == [1, 2, 3]
+
+    async def test_run_detail_response_matches_model(self, storage, monkeypatch):
+        """Test the streamed run detail parses to the same RunDetail as get_run()."""
+        from httpx import AsyncClient, ASGITransport
+
+        from app import main
+        from app.schemas import RunDetail
+
+        monkeypatch.setattr(main, "get_storage", lambda: storage)
+        storage.create_run("run-1", {"message": "pay"})
+        storage.save_events([_event(seq) for seq in range(1, 4)])
+
+        async with AsyncClient(transport=ASGITransport(app=main.app), base_url="http://test") as client:
+            response = await client.get("/api/runbook/run/run-1")
+
+        assert response.status_code == 200
+        assert RunDetail.model_validate_json(response.content) == RunDetail.model_validate(
+            storage.get_run("run-1").model_dump(mode="json")
+        )